@@ -0,0 +1,91 @@
+"""convert enum columns to smallint codes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-01-01 00:03:00
+
+"""
+from typing import Sequence, Tuple, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Codes follow the member order of the CodedEnums in app/models, frozen here as of this revision.
+# The old sensor_type_enum label 'other' has no SensorType member (the API never accepted it),
+# so rows holding it get no code and stop the upgrade on NOT NULL for manual review.
+SENSOR_TYPES = ('temperature', 'humidity', 'pressure', 'motion', 'light', 'sound')
+SENSOR_STATUSES = ('active', 'inactive', 'maintenance')
+DATA_STATUSES = ('pending', 'validated', 'archived', 'invalid')
+
+
+def _to_code(column: str, labels: Tuple[str, ...]) -> str:
+    """CASE expression mapping an enum label to its SMALLINT code"""
+    branches = " ".join(f"WHEN '{label}' THEN {code}" for code, label in enumerate(labels))
+    return f"CASE {column}::text {branches} END"
+
+
+def _to_label(column: str, labels: Tuple[str, ...]) -> str:
+    """CASE expression mapping a SMALLINT code back to its enum label"""
+    branches = " ".join(f"WHEN {code} THEN '{label}'" for code, label in enumerate(labels))
+    return f"CASE {column} {branches} END"
+
+
+def upgrade() -> None:
+    op.execute(f"""
+        ALTER TABLE sensors
+            ALTER COLUMN sensor_type TYPE SMALLINT USING {_to_code('sensor_type', SENSOR_TYPES)},
+            ALTER COLUMN status DROP DEFAULT,
+            ALTER COLUMN status TYPE SMALLINT USING {_to_code('status', SENSOR_STATUSES)},
+            ALTER COLUMN status SET DEFAULT 0,
+            ADD CONSTRAINT sensors_sensor_type_check CHECK (sensor_type BETWEEN 0 AND {len(SENSOR_TYPES) - 1}),
+            ADD CONSTRAINT sensors_status_check CHECK (status BETWEEN 0 AND {len(SENSOR_STATUSES) - 1});
+        
+        ALTER TABLE sensor_data
+            ALTER COLUMN status DROP DEFAULT,
+            ALTER COLUMN status TYPE SMALLINT USING {_to_code('status', DATA_STATUSES)},
+            ALTER COLUMN status SET DEFAULT 0,
+            ADD CONSTRAINT sensor_data_status_check CHECK (status BETWEEN 0 AND {len(DATA_STATUSES) - 1});
+        
+        DROP TYPE sensor_type_enum;
+        DROP TYPE sensor_status_enum;
+        DROP TYPE data_status_enum;
+    """)
+
+
+def downgrade() -> None:
+    # Code 5 ('sound') has no label in sensor_type_enum and likewise stops the downgrade
+    op.execute(f"""
+        CREATE TYPE sensor_type_enum AS ENUM (
+            'temperature', 'humidity', 'pressure', 'motion', 'light', 'other'
+        );
+        
+        CREATE TYPE sensor_status_enum AS ENUM (
+            'active', 'inactive', 'maintenance'
+        );
+        
+        CREATE TYPE data_status_enum AS ENUM (
+            'pending', 'validated', 'archived', 'invalid'
+        );
+        
+        ALTER TABLE sensor_data
+            DROP CONSTRAINT sensor_data_status_check,
+            ALTER COLUMN status DROP DEFAULT,
+            ALTER COLUMN status TYPE data_status_enum
+                USING ({_to_label('status', DATA_STATUSES)})::data_status_enum,
+            ALTER COLUMN status SET DEFAULT 'pending';
+        
+        ALTER TABLE sensors
+            DROP CONSTRAINT sensors_sensor_type_check,
+            DROP CONSTRAINT sensors_status_check,
+            ALTER COLUMN sensor_type TYPE sensor_type_enum
+                USING ({_to_label('sensor_type', SENSOR_TYPES)})::sensor_type_enum,
+            ALTER COLUMN status DROP DEFAULT,
+            ALTER COLUMN status TYPE sensor_status_enum
+                USING ({_to_label('status', SENSOR_STATUSES)})::sensor_status_enum,
+            ALTER COLUMN status SET DEFAULT 'active';
+    """)
@@ -0,0 +1,152 @@
+"""partition sensor_data by month
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-01-01 00:04:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months of partitions kept ahead of the current one; the app tops this up daily
+# through ensure_sensor_data_partitions (see app/tasks.py)
+PARTITION_MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    op.execute("""
+        -- Free the names the partitioned table takes over; the id sequence survives the old table
+        ALTER TABLE sensor_data RENAME TO sensor_data_unpartitioned;
+        ALTER TABLE sensor_data_unpartitioned RENAME CONSTRAINT sensor_data_pkey TO sensor_data_unpartitioned_pkey;
+        ALTER SEQUENCE sensor_data_id_seq OWNED BY NONE;
+        DROP INDEX idx_sensor_data_sensor_id, idx_sensor_data_status,
+            idx_sensor_data_timestamp, idx_sensor_data_sensor_timestamp;
+        
+        CREATE TABLE sensor_data (
+            id INTEGER NOT NULL DEFAULT nextval('sensor_data_id_seq'),
+            sensor_id INTEGER NOT NULL REFERENCES sensors(id) ON DELETE CASCADE,
+            value DOUBLE PRECISION NOT NULL,
+            unit VARCHAR(50),
+            status SMALLINT NOT NULL DEFAULT 0 CONSTRAINT sensor_data_status_check CHECK (status BETWEEN 0 AND 3),
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp);
+        ALTER SEQUENCE sensor_data_id_seq OWNED BY sensor_data.id;
+        
+        -- Catches rows no monthly partition covers yet
+        CREATE TABLE sensor_data_default PARTITION OF sensor_data DEFAULT;
+        
+        -- Covering indexes: each list query (see SensorDataRepository) is answered by an
+        -- index-only scan in its ORDER BY order
+        CREATE INDEX idx_sensor_data_status ON sensor_data(status, timestamp DESC, id DESC)
+            INCLUDE (sensor_id, value, unit);
+        CREATE INDEX idx_sensor_data_timestamp ON sensor_data(timestamp DESC, id DESC)
+            INCLUDE (sensor_id, value, unit, status);
+        CREATE INDEX idx_sensor_data_sensor_timestamp ON sensor_data(sensor_id, timestamp DESC, id DESC)
+            INCLUDE (value, unit, status);
+        
+        -- Create the partition for the month containing `month` unless it exists. Rows already
+        -- parked in the default partition for that month are moved into it first, since
+        -- attaching a partition whose range still has rows in the default one fails.
+        CREATE FUNCTION create_sensor_data_partition(month DATE) RETURNS VOID
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            start_at DATE := date_trunc('month', month)::DATE;
+            end_at DATE := (date_trunc('month', month) + INTERVAL '1 month')::DATE;
+            partition_name TEXT := 'sensor_data_' || to_char(start_at, 'YYYY_MM');
+        BEGIN
+            IF to_regclass(partition_name) IS NOT NULL THEN
+                RETURN;
+            END IF;
+            -- Hold writers off the default partition until the new one is attached
+            LOCK TABLE sensor_data_default IN EXCLUSIVE MODE;
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE sensor_data INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                partition_name
+            );
+            EXECUTE format(
+                'WITH moved AS (
+                    DELETE FROM sensor_data_default WHERE timestamp >= %L AND timestamp < %L RETURNING *
+                 )
+                 INSERT INTO %I SELECT * FROM moved',
+                start_at, end_at, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE sensor_data ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, start_at, end_at
+            );
+        END;
+        $$;
+        
+        -- Make sure partitions exist from the current month through `months_ahead` months ahead.
+        -- Idempotent, and serialised so several app processes can call it at once.
+        CREATE FUNCTION ensure_sensor_data_partitions(months_ahead INTEGER) RETURNS VOID
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('ensure_sensor_data_partitions'));
+            FOR month_offset IN 0..months_ahead LOOP
+                PERFORM create_sensor_data_partition(
+                    (date_trunc('month', now()) + make_interval(months => month_offset))::DATE
+                );
+            END LOOP;
+        END;
+        $$;
+    """)
+    
+    # One partition per month that already holds data, then the months ahead;
+    # rows stored without a timestamp are stamped with the migration time
+    op.execute("""
+        SELECT create_sensor_data_partition(month)
+        FROM (
+            SELECT DISTINCT date_trunc('month', COALESCE(timestamp, now()))::DATE AS month
+            FROM sensor_data_unpartitioned
+        ) AS months;
+    """)
+    op.execute(f"SELECT ensure_sensor_data_partitions({PARTITION_MONTHS_AHEAD});")
+    op.execute("""
+        INSERT INTO sensor_data (id, sensor_id, value, unit, status, timestamp)
+        SELECT id, sensor_id, value, unit, status, COALESCE(timestamp, now())
+        FROM sensor_data_unpartitioned;
+        
+        DROP TABLE sensor_data_unpartitioned;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP FUNCTION ensure_sensor_data_partitions(INTEGER);
+        DROP FUNCTION create_sensor_data_partition(DATE);
+        
+        ALTER TABLE sensor_data RENAME TO sensor_data_partitioned;
+        ALTER TABLE sensor_data_partitioned RENAME CONSTRAINT sensor_data_pkey TO sensor_data_partitioned_pkey;
+        ALTER SEQUENCE sensor_data_id_seq OWNED BY NONE;
+        DROP INDEX idx_sensor_data_status, idx_sensor_data_timestamp, idx_sensor_data_sensor_timestamp;
+        
+        CREATE TABLE sensor_data (
+            id INTEGER PRIMARY KEY DEFAULT nextval('sensor_data_id_seq'),
+            sensor_id INTEGER NOT NULL REFERENCES sensors(id) ON DELETE CASCADE,
+            value DOUBLE PRECISION NOT NULL,
+            unit VARCHAR(50),
+            status SMALLINT NOT NULL DEFAULT 0 CONSTRAINT sensor_data_status_check CHECK (status BETWEEN 0 AND 3),
+            timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        );
+        ALTER SEQUENCE sensor_data_id_seq OWNED BY sensor_data.id;
+        
+        INSERT INTO sensor_data (id, sensor_id, value, unit, status, timestamp)
+        SELECT id, sensor_id, value, unit, status, timestamp
+        FROM sensor_data_partitioned;
+        
+        DROP TABLE sensor_data_partitioned CASCADE;
+        
+        CREATE INDEX idx_sensor_data_sensor_id ON sensor_data(sensor_id);
+        CREATE INDEX idx_sensor_data_status ON sensor_data(status);
+        CREATE INDEX idx_sensor_data_timestamp ON sensor_data(timestamp);
+        CREATE INDEX idx_sensor_data_sensor_timestamp ON sensor_data(sensor_id, timestamp DESC);
+    """)
@@ -0,0 +1,53 @@
+"""create unit_statistics materialized view
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-01-01 00:05:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sensor status codes: 0 = active, 1 = inactive (SensorStatus in app/models/sensor.py)
+    op.execute("""
+        CREATE MATERIALIZED VIEW unit_statistics AS
+        SELECT
+            u.id AS unit_id,
+            u.name AS unit_name,
+            COALESCE(s_stats.total_sensors, 0) AS total_sensors,
+            COALESCE(s_stats.active_sensors, 0) AS active_sensors,
+            COALESCE(s_stats.inactive_sensors, 0) AS inactive_sensors,
+            COALESCE(d_stats.total_data_points, 0) AS total_data_points,
+            d_stats.latest_data_timestamp
+        FROM units u
+        LEFT JOIN (
+            SELECT
+                unit_id,
+                COUNT(*) AS total_sensors,
+                COUNT(*) FILTER (WHERE status = 0) AS active_sensors,
+                COUNT(*) FILTER (WHERE status = 1) AS inactive_sensors
+            FROM sensors
+            GROUP BY unit_id
+        ) s_stats ON s_stats.unit_id = u.id
+        LEFT JOIN (
+            SELECT s.unit_id, COUNT(*) AS total_data_points, MAX(sd.timestamp) AS latest_data_timestamp
+            FROM sensor_data sd
+            JOIN sensors s ON s.id = sd.sensor_id
+            GROUP BY s.unit_id
+        ) d_stats ON d_stats.unit_id = u.id;
+        
+        CREATE UNIQUE INDEX idx_unit_statistics_unit_id ON unit_statistics(unit_id);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS unit_statistics;")
@@ -0,0 +1,41 @@
+"""add list query indexes for units and sensors
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-01-01 00:06:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        -- Newest-first lists, and sensors by unit answered by an index-only scan in ORDER BY order
+        DROP INDEX idx_units_created_at;
+        CREATE INDEX idx_units_created_at ON units(created_at DESC);
+        
+        DROP INDEX idx_sensors_unit_id, idx_sensors_created_at;
+        CREATE INDEX idx_sensors_unit_status ON sensors(unit_id, status);
+        CREATE INDEX idx_sensors_unit_created ON sensors(unit_id, created_at DESC)
+            INCLUDE (name, sensor_type, status, description);
+        CREATE INDEX idx_sensors_created_at ON sensors(created_at DESC);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP INDEX idx_units_created_at;
+        CREATE INDEX idx_units_created_at ON units(created_at);
+        
+        DROP INDEX idx_sensors_unit_status, idx_sensors_unit_created, idx_sensors_created_at;
+        CREATE INDEX idx_sensors_unit_id ON sensors(unit_id);
+        CREATE INDEX idx_sensors_created_at ON sensors(created_at);
+    """)
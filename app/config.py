@@ -1,14 +1,63 @@
 from pydantic_settings import BaseSettings
-from pydantic import Field, ConfigDict, ValidationError
+from pydantic import Field, ConfigDict, ValidationError, model_validator
+from functools import cached_property, lru_cache
+from typing import Optional
+from urllib.parse import quote
+import os
 import sys
 
 
+def _default_pool_max() -> int:
+    """Default pool ceiling: four connections per CPU, capped at 100"""
+    return min(100, max(10, 4 * (os.cpu_count() or 1)))
+
+
 class Settings(BaseSettings):
     database_user: str = Field(..., description="Database username")
     database_password: str = Field(..., description="Database password")
     database_host: str = Field(..., description="Database host")
     database_port: int = Field(..., description="Database port")
     database_name: str = Field(..., description="Database name")
+    database_pool_min: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Minimum pooled connections; defaults to the maximum so the pool is fully preallocated"
+    )
+    database_pool_max: int = Field(
+        default_factory=_default_pool_max,
+        ge=1,
+        description="Maximum pooled connections"
+    )
+    database_statement_cache_size: int = Field(
+        1024,
+        ge=0,
+        description="Prepared statements cached per connection; set 0 behind a transaction-pooling PgBouncer"
+    )
+    unit_statistics_refresh_seconds: int = Field(
+        60,
+        ge=1,
+        description="Interval between unit_statistics materialized view refreshes"
+    )
+    sensor_data_partition_months_ahead: int = Field(
+        3,
+        ge=1,
+        description="Monthly sensor_data partitions kept ready ahead of the current month"
+    )
+    sensor_data_partition_check_seconds: int = Field(
+        86400,
+        ge=60,
+        description="Interval between checks that the upcoming sensor_data partitions exist"
+    )
+    health_check_interval_seconds: float = Field(
+        5,
+        gt=0,
+        description="Interval between background database health probes"
+    )
+    health_check_timeout_seconds: float = Field(
+        2,
+        gt=0,
+        description="Time a health probe may take, pool acquisition included, before it counts as failed"
+    )
     
     model_config = ConfigDict(
         env_file=".env",
@@ -17,10 +66,20 @@ class Settings(BaseSettings):
         extra="ignore"
     )
     
-    @property
+    @model_validator(mode="after")
+    def _resolve_pool_min(self) -> "Settings":
+        """Preallocate the whole pool unless a smaller minimum is configured"""
+        if self.database_pool_min is None or self.database_pool_min > self.database_pool_max:
+            self.database_pool_min = self.database_pool_max
+        return self
+    
+    @cached_property
     def database_url(self) -> str:
-        """Generate database URL from individual components"""
-        return f"postgresql://{self.database_user}:{self.database_password}@{self.database_host}:{self.database_port}/{self.database_name}"
+        """Database URL built once from the individual components"""
+        return (
+            f"postgresql://{quote(self.database_user, safe='')}:{quote(self.database_password, safe='')}"
+            f"@{self.database_host}:{self.database_port}/{self.database_name}"
+        )
 
 
 def load_settings() -> Settings:
@@ -64,4 +123,10 @@ DATABASE_NAME=iot_sensors
         sys.exit(1)
 
 
-settings = load_settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing the environment only once"""
+    return load_settings()
+
+
+settings = get_settings()
\ No newline at end of file
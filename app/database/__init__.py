@@ -1,3 +1,3 @@
-from app.database.connection import DatabasePool
+from app.database.connection import DatabasePool, bind_request_connection
 
-__all__ = ["DatabasePool"]
+__all__ = ["DatabasePool", "bind_request_connection"]
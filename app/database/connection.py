@@ -1,24 +1,86 @@
+import asyncio
+import re
 import asyncpg
-from typing import Optional
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, List, Optional
 from app.config import settings
 
 
+# Positional parameters ($1, $2, ...) of a query
+_PARAMETER = re.compile(r"\$(\d+)")
+
+# Connection bound to the current request/task, shared by every repository call
+_current_connection: ContextVar[Optional[asyncpg.Connection]] = ContextVar(
+    "current_connection", default=None
+)
+
+
 class DatabasePool:
     _pool: Optional[asyncpg.Pool] = None
+    _lock: Optional[asyncio.Lock] = None
+    # Queries prepared on every new connection, registered by the repositories
+    _hot_statements: List[str] = []
+    
+    @classmethod
+    def register_hot_statements(cls, *queries: str):
+        """Have every new pooled connection prepare these queries up front"""
+        cls._hot_statements.extend(query for query in queries if query not in cls._hot_statements)
+    
+    @classmethod
+    async def _prepare_hot_statements(cls, connection: asyncpg.Connection):
+        """
+        Pool init hook: fill the connection's statement cache before it serves a request.
+        Each statement runs once with NULL arguments inside a transaction that is rolled back,
+        so nothing is written and the connection is left idle, holding no locks.
+        """
+        if settings.database_statement_cache_size == 0 or not cls._hot_statements:
+            return
+        # prepare() would keep its statement out of the cache fetch()/execute() consult
+        transaction = connection.transaction()
+        await transaction.start()
+        try:
+            for query in cls._hot_statements:
+                arguments = [None] * max(map(int, _PARAMETER.findall(query)), default=0)
+                try:
+                    async with connection.transaction():
+                        await connection.fetch(query, *arguments)
+                except asyncpg.PostgresError:
+                    # e.g. NOT NULL violations; the statement was prepared and cached all the same
+                    pass
+        finally:
+            await transaction.rollback()
+    
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        """Lazily create the lock guarding pool creation"""
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        return cls._lock
     
     @classmethod
     async def create_pool(cls):
         """Create database connection pool"""
-        if cls._pool is None:
-            cls._pool = await asyncpg.create_pool(
-                host=settings.database_host,
-                port=settings.database_port,
-                database=settings.database_name,
-                user=settings.database_user,
-                password=settings.database_password,
-                min_size=5,
-                max_size=20,
-            )
+        if cls._pool is not None:
+            return cls._pool
+        
+        async with cls._get_lock():
+            # Another caller may have created the pool while we waited
+            if cls._pool is None:
+                cls._pool = await asyncpg.create_pool(
+                    dsn=settings.database_url,
+                    min_size=settings.database_pool_min,
+                    max_size=settings.database_pool_max,
+                    max_inactive_connection_lifetime=300,
+                    max_queries=50000,
+                    command_timeout=30,
+                    # Every query is parameterised, so each connection parses and plans it once
+                    statement_cache_size=settings.database_statement_cache_size,
+                    max_cacheable_statement_size=15 * 1024,
+                    max_cached_statement_lifetime=0,
+                    server_settings={"jit": "off"},
+                    init=cls._prepare_hot_statements,
+                )
         return cls._pool
     
     @classmethod
@@ -34,3 +96,33 @@ class DatabasePool:
         if cls._pool is None:
             raise RuntimeError("Database pool not initialized. Call create_pool() first.")
         return cls._pool
+    
+    @classmethod
+    @asynccontextmanager
+    async def connection(cls) -> AsyncIterator[asyncpg.Connection]:
+        """Yield the connection bound to the current context, acquiring one if needed"""
+        connection = _current_connection.get()
+        if connection is not None:
+            yield connection
+            return
+
+        async with cls.get_pool().acquire() as connection:
+            token = _current_connection.set(connection)
+            try:
+                yield connection
+            finally:
+                _current_connection.reset(token)
+    
+    @classmethod
+    @asynccontextmanager
+    async def transaction(cls) -> AsyncIterator[asyncpg.Connection]:
+        """Run the enclosed repository calls on one connection inside a transaction"""
+        async with cls.connection() as connection:
+            async with connection.transaction():
+                yield connection
+
+
+async def bind_request_connection() -> AsyncIterator[asyncpg.Connection]:
+    """FastAPI dependency that pins one pooled connection for the whole handler"""
+    async with DatabasePool.connection() as connection:
+        yield connection
@@ -1,8 +1,8 @@
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi import HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError
+import asyncpg
 from app.exceptions import (
     NotFoundException,
     BadRequestException,
@@ -16,153 +16,111 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-async def not_found_exception_handler(request: Request, exc: NotFoundException):
-    """Handle NotFoundException (404)"""
-    logger.warning(f"Not found: {exc.detail}")
-    return JSONResponse(
-        status_code=status.HTTP_404_NOT_FOUND,
-        content={
-            "error": "Not Found",
-            "message": exc.detail,
-            "path": str(request.url)
-        }
-    )
-
-
-async def bad_request_exception_handler(request: Request, exc: BadRequestException):
-    """Handle BadRequestException (400)"""
-    logger.warning(f"Bad request: {exc.detail}")
-    return JSONResponse(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        content={
-            "error": "Bad Request",
-            "message": exc.detail,
-            "path": str(request.url)
-        }
-    )
-
-
-async def conflict_exception_handler(request: Request, exc: ConflictException):
-    """Handle ConflictException (409)"""
-    logger.warning(f"Conflict: {exc.detail}")
-    return JSONResponse(
-        status_code=status.HTTP_409_CONFLICT,
-        content={
-            "error": "Conflict",
-            "message": exc.detail,
-            "path": str(request.url)
-        }
-    )
-
-
-async def validation_exception_handler(request: Request, exc: ValidationException):
-    """Handle ValidationException (422)"""
-    logger.warning(f"Validation error: {exc.detail}")
-    return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={
-            "error": "Validation Error",
-            "message": exc.detail,
-            "path": str(request.url)
-        }
-    )
-
-
-async def database_exception_handler(request: Request, exc: DatabaseException):
-    """Handle DatabaseException (503)"""
-    logger.error(f"Database error: {exc.detail}")
-    return JSONResponse(
-        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-        content={
-            "error": "Database Error",
-            "message": exc.detail,
-            "path": str(request.url)
-        }
-    )
+# Custom exception -> (status code, error label, log level, log prefix)
+_APP_EXCEPTIONS = {
+    NotFoundException: (status.HTTP_404_NOT_FOUND, "Not Found", logging.WARNING, "Not found"),
+    BadRequestException: (status.HTTP_400_BAD_REQUEST, "Bad Request", logging.WARNING, "Bad request"),
+    ConflictException: (status.HTTP_409_CONFLICT, "Conflict", logging.WARNING, "Conflict"),
+    ValidationException: (
+        status.HTTP_422_UNPROCESSABLE_ENTITY, "Validation Error", logging.WARNING, "Validation error"
+    ),
+    DatabaseException: (
+        status.HTTP_503_SERVICE_UNAVAILABLE, "Database Error", logging.ERROR, "Database error"
+    ),
+    InternalServerException: (
+        status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal Server Error", logging.CRITICAL, "Internal server error"
+    ),
+}
+
+# asyncpg error -> (status code, error label, message)
+_DATABASE_ERRORS = {
+    asyncpg.IntegrityConstraintViolationError: (
+        status.HTTP_409_CONFLICT, "Database Integrity Error", "Operation violates database constraints"
+    ),
+    asyncpg.PostgresConnectionError: (
+        status.HTTP_503_SERVICE_UNAVAILABLE, "Database Connection Error", "Could not connect to database"
+    ),
+    asyncpg.InterfaceError: (
+        status.HTTP_503_SERVICE_UNAVAILABLE, "Database Connection Error", "Could not connect to database"
+    ),
+}
+_DATABASE_ERROR_DEFAULT = (
+    status.HTTP_500_INTERNAL_SERVER_ERROR, "Database Error", "An error occurred while processing your request"
+)
 
 
-async def internal_server_exception_handler(request: Request, exc: InternalServerException):
-    """Handle InternalServerException (500)"""
-    logger.critical(f"Internal server error: {exc.detail}")
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+async def app_exception_handler(request: Request, exc: HTTPException):
+    """Handle the application's custom exceptions using the _APP_EXCEPTIONS table"""
+    for exc_class in type(exc).__mro__:
+        if exc_class in _APP_EXCEPTIONS:
+            status_code, error, level, log_prefix = _APP_EXCEPTIONS[exc_class]
+            break
+    logger.log(level, "%s: %s", log_prefix, exc.detail)
+    return ORJSONResponse(
+        status_code=status_code,
         content={
-            "error": "Internal Server Error",
+            "error": error,
             "message": exc.detail,
-            "path": str(request.url)
+            "path": request.scope["path"]
         }
     )
 
 
 async def request_validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle FastAPI RequestValidationError (422)"""
-    logger.warning(f"Request validation error: {exc.errors()}")
-    return JSONResponse(
+    errors = exc.errors()
+    logger.warning("Request validation error: %s", errors)
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": "Request Validation Error",
             "message": "Invalid request data",
-            "details": exc.errors(),
-            "path": str(request.url)
+            "details": errors,
+            "path": request.scope["path"]
         }
     )
 
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle general HTTP exceptions"""
-    logger.warning(f"HTTP exception {exc.status_code}: {exc.detail}")
-    return JSONResponse(
+    logger.warning("HTTP exception %s: %s", exc.status_code, exc.detail)
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": "HTTP Error",
             "message": exc.detail,
-            "path": str(request.url)
+            "path": request.scope["path"]
         }
     )
 
 
-async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
-    """Handle SQLAlchemy errors"""
-    logger.error(f"SQLAlchemy error: {str(exc)}")
-    
-    if isinstance(exc, IntegrityError):
-        return JSONResponse(
-            status_code=status.HTTP_409_CONFLICT,
-            content={
-                "error": "Database Integrity Error",
-                "message": "Operation violates database constraints",
-                "path": str(request.url)
-            }
-        )
-    elif isinstance(exc, OperationalError):
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content={
-                "error": "Database Connection Error",
-                "message": "Could not connect to database",
-                "path": str(request.url)
-            }
-        )
-    else:
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "error": "Database Error",
-                "message": "An error occurred while processing your request",
-                "path": str(request.url)
-            }
-        )
+async def database_exception_handler(request: Request, exc: Exception):
+    """Handle asyncpg errors using the _DATABASE_ERRORS table"""
+    logger.error("Database error: %s", exc)
+    status_code, error, message = _DATABASE_ERROR_DEFAULT
+    for exc_class in type(exc).__mro__:
+        if exc_class in _DATABASE_ERRORS:
+            status_code, error, message = _DATABASE_ERRORS[exc_class]
+            break
+    return ORJSONResponse(
+        status_code=status_code,
+        content={
+            "error": error,
+            "message": message,
+            "path": request.scope["path"]
+        }
+    )
 
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions"""
-    logger.critical(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    logger.critical("Unhandled exception: %s", exc, exc_info=True)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": "Internal Server Error",
             "message": "An unexpected error occurred. Please try again later.",
-            "path": str(request.url)
+            "path": request.scope["path"]
         }
     )
 
@@ -171,19 +129,16 @@ def register_exception_handlers(app):
     """Register all exception handlers to the FastAPI app"""
     
     # Custom exceptions
-    app.add_exception_handler(NotFoundException, not_found_exception_handler)
-    app.add_exception_handler(BadRequestException, bad_request_exception_handler)
-    app.add_exception_handler(ConflictException, conflict_exception_handler)
-    app.add_exception_handler(ValidationException, validation_exception_handler)
-    app.add_exception_handler(DatabaseException, database_exception_handler)
-    app.add_exception_handler(InternalServerException, internal_server_exception_handler)
+    for exc_class in _APP_EXCEPTIONS:
+        app.add_exception_handler(exc_class, app_exception_handler)
     
     # FastAPI built-in exceptions
     app.add_exception_handler(RequestValidationError, request_validation_exception_handler)
     app.add_exception_handler(StarletteHTTPException, http_exception_handler)
     
     # Database exceptions
-    app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
+    app.add_exception_handler(asyncpg.PostgresError, database_exception_handler)
+    app.add_exception_handler(asyncpg.InterfaceError, database_exception_handler)
     
     # Catch-all for unhandled exceptions
     app.add_exception_handler(Exception, general_exception_handler)
@@ -1,10 +1,19 @@
-from fastapi import FastAPI
-from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import logging
 
-from app.database import DatabasePool
+from app.config import settings
+from app.database import DatabasePool, bind_request_connection
 from app.routers import units, sensors, sensor_data
 from app.exception_handlers import register_exception_handlers
+from app.tasks import (
+    get_database_health,
+    probe_database_periodically,
+    refresh_unit_statistics_periodically,
+    create_sensor_data_partitions_periodically
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,18 +29,35 @@ async def lifespan(app: FastAPI):
         await DatabasePool.create_pool()
         logger.info("Database pool initialized successfully")
     except Exception as e:
-        logger.critical(f"Failed to initialize database pool: {str(e)}")
+        logger.critical("Failed to initialize database pool: %s", e)
         raise
     
+    background_tasks = [
+        asyncio.create_task(probe_database_periodically(settings.health_check_interval_seconds)),
+        asyncio.create_task(
+            refresh_unit_statistics_periodically(settings.unit_statistics_refresh_seconds)
+        ),
+        asyncio.create_task(
+            create_sensor_data_partitions_periodically(
+                settings.sensor_data_partition_check_seconds,
+                settings.sensor_data_partition_months_ahead
+            )
+        ),
+    ]
+    
     yield  # Application runs here
     
     # Shutdown
     logger.info("Shutting down application...")
+    for task in background_tasks:
+        task.cancel()
+    with suppress(asyncio.CancelledError):
+        await asyncio.gather(*background_tasks)
     try:
         await DatabasePool.close_pool()
         logger.info("Database pool closed successfully")
     except Exception as e:
-        logger.error(f"Error closing database pool: {str(e)}")
+        logger.error("Error closing database pool: %s", e)
 
 
 # Create FastAPI app with lifespan
@@ -39,16 +65,18 @@ app = FastAPI(
     title="Sensor Management API",
     description="API for managing units, sensors, and sensor data",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Register exception handlers
 register_exception_handlers(app)
 
-# Include routers
-app.include_router(units.router, prefix="/api/v1")
-app.include_router(sensors.router, prefix="/api/v1")
-app.include_router(sensor_data.router, prefix="/api/v1")
+# Include routers; each request reuses a single pooled connection for all its queries
+request_connection = Depends(bind_request_connection, scope="function")
+app.include_router(units.router, prefix="/api/v1", dependencies=[request_connection])
+app.include_router(sensors.router, prefix="/api/v1", dependencies=[request_connection])
+app.include_router(sensor_data.router, prefix="/api/v1", dependencies=[request_connection])
 
 
 @app.get("/")
@@ -63,20 +91,17 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    try:
-        pool = DatabasePool.get_pool()
-        # Try to get a connection to verify pool is working
-        async with pool.acquire() as conn:
-            await conn.fetchval("SELECT 1")
+    """Health check endpoint, served from the periodically refreshed database probe"""
+    health = await get_database_health()
+    if health["ok"]:
         return {
             "status": "healthy",
-            "database": "connected"
+            "database": "connected",
+            "checked_at": health["checked_at"]
         }
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        return {
-            "status": "unhealthy",
-            "database": "disconnected",
-            "error": str(e)
-        }
\ No newline at end of file
+    return {
+        "status": "unhealthy",
+        "database": "disconnected",
+        "error": health["error"],
+        "checked_at": health["checked_at"]
+    }
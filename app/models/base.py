@@ -0,0 +1,42 @@
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Tuple, Type
+from pydantic import ConfigDict, Field
+
+
+# Shared field and config definitions, built once and reused by every model
+NAME_FIELD = Field(..., min_length=1, max_length=255)
+OPTIONAL_NAME_FIELD = Field(None, min_length=1, max_length=255)
+READ_MODEL_CONFIG = ConfigDict(from_attributes=True, use_enum_values=True)
+
+
+class CodedEnum(str, Enum):
+    """
+    String enum persisted as a SMALLINT code.
+    Codes follow definition order, so new members must only be appended,
+    and the column's CHECK constraint widened by a new migration.
+    """
+    
+    def to_int(self) -> int:
+        """Return the code stored in the database for this member"""
+        return _codes(type(self))[self]
+    
+    @classmethod
+    def from_int(cls, code: int) -> "CodedEnum":
+        """Return the member stored in the database under the given code"""
+        return _members(cls)[code]
+    
+    @classmethod
+    def by_code(cls) -> Tuple["CodedEnum", ...]:
+        """Return every member, indexed by its database code"""
+        return _members(cls)
+
+
+@lru_cache(maxsize=None)
+def _members(enum_class: Type[CodedEnum]) -> Tuple[CodedEnum, ...]:
+    return tuple(enum_class)
+
+
+@lru_cache(maxsize=None)
+def _codes(enum_class: Type[CodedEnum]) -> Dict[CodedEnum, int]:
+    return {member: code for code, member in enumerate(enum_class)}
@@ -1,10 +1,10 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from enum import Enum
+from app.models.base import CodedEnum, OPTIONAL_NAME_FIELD, READ_MODEL_CONFIG
 
 
-class SensorType(str, Enum):
+class SensorType(CodedEnum):
     """Available sensor types"""
     temperature = "temperature"
     humidity = "humidity"
@@ -15,7 +15,7 @@ class SensorType(str, Enum):
 
 
 
-class SensorStatus(str, Enum):
+class SensorStatus(CodedEnum):
     """Sensor status options"""
     active = "active"
     inactive = "inactive"
@@ -43,7 +43,7 @@ class SensorCreate(SensorBase):
 
 
 class SensorUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    name: Optional[str] = OPTIONAL_NAME_FIELD
     sensor_type: Optional[SensorType] = None
     status: Optional[SensorStatus] = None
     description: Optional[str] = None
@@ -53,6 +53,5 @@ class Sensor(SensorBase):
     """Complete sensor model with metadata"""
     id: int = Field(..., description="Unique sensor ID")
     created_at: datetime = Field(..., description="Timestamp when sensor was created")
-
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    
+    model_config = READ_MODEL_CONFIG
\ No newline at end of file
@@ -1,10 +1,10 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
-from enum import Enum
+from app.models.base import CodedEnum, READ_MODEL_CONFIG
 
 
-class DataStatus(str, Enum):
+class DataStatus(CodedEnum):
     PENDING = "pending"
     VALIDATED = "validated"
     ARCHIVED = "archived"
@@ -33,7 +33,7 @@ class SensorData(SensorDataBase):
     id: int
     timestamp: datetime
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = READ_MODEL_CONFIG
 
 
 class SensorDataWithDetails(SensorData):
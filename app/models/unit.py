@@ -1,10 +1,11 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
+from app.models.base import NAME_FIELD, OPTIONAL_NAME_FIELD, READ_MODEL_CONFIG
 
 
 class UnitBase(BaseModel):
-    name: str = Field(..., min_length=1, max_length=255)
+    name: str = NAME_FIELD
     location: str = Field(..., min_length=1, max_length=500)
     description: Optional[str] = None
 
@@ -14,7 +15,7 @@ class UnitCreate(UnitBase):
 
 
 class UnitUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    name: Optional[str] = OPTIONAL_NAME_FIELD
     location: Optional[str] = Field(None, min_length=1, max_length=500)
     description: Optional[str] = None
 
@@ -23,7 +24,7 @@ class Unit(UnitBase):
     id: int
     created_at: datetime
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = READ_MODEL_CONFIG
 
 
 class UnitStatistics(BaseModel):
@@ -1,43 +1,109 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, AsyncIterator, Dict, Mapping, Sequence, Tuple, Type
 import asyncpg
 from app.database import DatabasePool
+from app.models.base import CodedEnum
 
 
 class BaseRepository(ABC):
     """Base repository class with common database operations"""
     
-    def __init__(self):
-        self.pool = DatabasePool.get_pool()
+    # Batches at least this large are loaded with COPY instead of executemany
+    BULK_COPY_THRESHOLD = 1000
+    
+    # Columns stored as SMALLINT codes, decoded to their enum when rows are read
+    CODED_COLUMNS: Dict[str, Type[CodedEnum]] = {}
+    
+    # Queries on the request path, prepared on each pooled connection as it opens
+    HOT_STATEMENTS: Tuple[str, ...] = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        DatabasePool.register_hot_statements(*cls.HOT_STATEMENTS)
+    
+    @property
+    def pool(self) -> asyncpg.Pool:
+        """Current pool, looked up per access so long-lived repositories survive pool restarts"""
+        return DatabasePool.get_pool()
     
     async def execute(self, query: str, *args) -> str:
         """Execute a query that modifies data (INSERT, UPDATE, DELETE)"""
-        async with self.pool.acquire() as connection:
+        async with DatabasePool.connection() as connection:
             return await connection.execute(query, *args)
     
     async def fetch_one(self, query: str, *args) -> Optional[asyncpg.Record]:
         """Fetch a single row"""
-        async with self.pool.acquire() as connection:
+        async with DatabasePool.connection() as connection:
             return await connection.fetchrow(query, *args)
     
     async def fetch_all(self, query: str, *args) -> List[asyncpg.Record]:
         """Fetch all rows"""
-        async with self.pool.acquire() as connection:
+        async with DatabasePool.connection() as connection:
             return await connection.fetch(query, *args)
     
     async def fetch_val(self, query: str, *args) -> Any:
         """Fetch a single value"""
-        async with self.pool.acquire() as connection:
+        async with DatabasePool.connection() as connection:
             return await connection.fetchval(query, *args)
     
-    @staticmethod
-    def record_to_dict(record: Optional[asyncpg.Record]) -> Optional[Dict]:
-        """Convert asyncpg.Record to dictionary"""
-        if record is None:
-            return None
-        return dict(record)
-    
-    @staticmethod
-    def records_to_list(records: List[asyncpg.Record]) -> List[Dict]:
-        """Convert list of asyncpg.Record to list of dictionaries"""
-        return [dict(record) for record in records]
+    async def iterate(self, query: str, *args, prefetch: int = 500) -> AsyncIterator[asyncpg.Record]:
+        """
+        Stream rows through a server-side cursor.
+        Uses its own connection, since a streamed response outlives the request-bound one.
+        """
+        async with self.pool.acquire() as connection:
+            async with connection.transaction():
+                async for record in connection.cursor(query, *args, prefetch=prefetch):
+                    yield record
+    
+    async def copy_records(self, table: str, records: Sequence[tuple], columns: List[str]) -> int:
+        """Bulk insert records in one transaction, returning the number of rows written"""
+        async with DatabasePool.connection() as connection:
+            async with connection.transaction():
+                await connection.execute("SET LOCAL synchronous_commit = OFF")
+                if len(records) >= self.BULK_COPY_THRESHOLD:
+                    await connection.copy_records_to_table(table, records=records, columns=columns)
+                else:
+                    placeholders = ", ".join(f"${index}" for index in range(1, len(columns) + 1))
+                    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+                    await connection.executemany(query, records)
+        return len(records)
+    
+    def decode_record(self, record: Optional[asyncpg.Record]) -> Optional[Mapping[str, Any]]:
+        """
+        Decode the coded columns of a record.
+        Records without coded columns are returned as-is, avoiding a per-row dict copy.
+        """
+        if record is None or not self.CODED_COLUMNS:
+            return record
+        row = dict(record)
+        for column, enum_class in self.CODED_COLUMNS.items():
+            if row.get(column) is not None:
+                row[column] = enum_class.from_int(row[column])
+        return row
+    
+    def decode_records(self, records: List[asyncpg.Record]) -> List[Mapping[str, Any]]:
+        """
+        Decode a list of records.
+        The coded columns present are resolved once per result set; if there are none,
+        the records are passed through untouched.
+        """
+        if not self.CODED_COLUMNS or not records:
+            return records
+        first = records[0]
+        coded = [
+            (column, enum_class.by_code())
+            for column, enum_class in self.CODED_COLUMNS.items()
+            if column in first
+        ]
+        if not coded:
+            return records
+        rows = []
+        for record in records:
+            row = dict(record)
+            for column, members in coded:
+                code = row[column]
+                if code is not None:
+                    row[column] = members[code]
+            rows.append(row)
+        return rows
\ No newline at end of file
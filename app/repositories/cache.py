@@ -0,0 +1,93 @@
+import asyncio
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Dict, Hashable, Optional
+
+
+# Result handed to coalesced callers when the lookup they waited on failed
+_FAILED = object()
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire ttl seconds after being stored"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Lookups currently running, so concurrent misses for one key share a single query
+        self.inflight: Dict[Hashable, asyncio.Future] = {}
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def pop(self, key: Hashable):
+        """Invalidate a single entry, including a lookup still in flight"""
+        self._entries.pop(key, None)
+        self.inflight.pop(key, None)
+    
+    def clear(self):
+        """Invalidate every entry"""
+        self._entries.clear()
+        self.inflight.clear()
+
+
+def async_ttl_cache(maxsize: int = 1024, ttl: float = 30):
+    """
+    Cache the non-None results of an async repository method keyed by its single argument.
+    The cache is shared by every instance and exposed as `method.cache` for invalidation.
+    Entries are per process, so other workers may serve a stale row for up to ttl seconds.
+    Concurrent misses for the same key wait for the first caller's query instead of repeating it.
+    """
+    def decorator(method):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        
+        @wraps(method)
+        async def wrapper(self, key):
+            while True:
+                value = cache.get(key)
+                if value is not None:
+                    return value
+                pending = cache.inflight.get(key)
+                if pending is None:
+                    break
+                # Shielded so a cancelled waiter does not cancel the shared lookup
+                value = await asyncio.shield(pending)
+                if value is not _FAILED:
+                    return value
+            
+            future = asyncio.get_running_loop().create_future()
+            cache.inflight[key] = future
+            value = _FAILED
+            try:
+                value = await method(self, key)
+            finally:
+                future.set_result(value)
+                # An invalidation during the query replaced or removed our entry; the
+                # result may predate it, so it is returned but not cached
+                if cache.inflight.get(key) is future:
+                    del cache.inflight[key]
+                    if value is not None and value is not _FAILED:
+                        cache.set(key, value)
+            return value
+        
+        wrapper.cache = cache
+        return wrapper
+    return decorator
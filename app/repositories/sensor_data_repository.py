@@ -1,153 +1,305 @@
-from typing import Optional, List, Dict
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional, List, Mapping, Tuple
 from app.repositories.base import BaseRepository
-from app.models import SensorDataCreate, SensorDataUpdate, DataStatus
+from app.models import SensorDataCreate, SensorDataUpdate, DataStatus, SensorType
+
+
+# Keyset pagination position: (timestamp, id) of the last row of the previous page
+Cursor = Tuple[datetime, int]
 
 
 class SensorDataRepository(BaseRepository):
     """Repository for SensorData entity operations"""
     
-    async def create(self, sensor_data: SensorDataCreate) -> Dict:
-        """Create a new sensor data entry"""
-        query = """
-            INSERT INTO sensor_data (sensor_id, value, unit, status)
-            VALUES ($1, $2, $3, $4)
+    CODED_COLUMNS = {"status": DataStatus, "previous_status": DataStatus, "sensor_type": SensorType}
+    
+    # Inserts nothing, instead of failing on the foreign key, when the sensor does not exist
+    INSERT_SQL = """
+        INSERT INTO sensor_data (sensor_id, value, unit, status)
+        SELECT $1, $2, $3, $4
+        WHERE EXISTS (SELECT 1 FROM sensors WHERE id = $1)
+        RETURNING id, sensor_id, value, unit, status, timestamp
+    """
+    
+    SELECT_BY_ID_SQL = """
+        SELECT id, sensor_id, value, unit, status, timestamp
+        FROM sensor_data
+        WHERE id = $1
+    """
+    
+    # Moves a row to $1 unless its current status is one of $3. Yields no row when
+    # the id does not exist, and a row with a NULL id when the transition is blocked
+    TRANSITION_STATUS_SQL = """
+        WITH current AS (
+            SELECT id, status FROM sensor_data WHERE id = $2
+        ), updated AS (
+            UPDATE sensor_data
+            SET status = $1
+            WHERE id = $2 AND status <> ALL($3::smallint[])
             RETURNING id, sensor_id, value, unit, status, timestamp
-        """
+        )
+        SELECT u.id, u.sensor_id, u.value, u.unit, u.status, u.timestamp,
+               c.status AS previous_status
+        FROM current c
+        LEFT JOIN updated u ON u.id = c.id
+    """
+    
+    SELECT_ALL_SQL = """
+        SELECT id, sensor_id, value, unit, status, timestamp
+        FROM sensor_data
+        ORDER BY timestamp DESC, id DESC
+        LIMIT $1 OFFSET $2
+    """
+    
+    SELECT_ALL_AFTER_SQL = """
+        SELECT id, sensor_id, value, unit, status, timestamp
+        FROM sensor_data
+        WHERE (timestamp, id) < ($1, $2)
+        ORDER BY timestamp DESC, id DESC
+        LIMIT $3
+    """
+    
+    SELECT_BY_SENSOR_ID_SQL = """
+        SELECT id, sensor_id, value, unit, status, timestamp
+        FROM sensor_data
+        WHERE sensor_id = $1
+        ORDER BY timestamp DESC, id DESC
+        LIMIT $2 OFFSET $3
+    """
+    
+    SELECT_BY_SENSOR_ID_AFTER_SQL = """
+        SELECT id, sensor_id, value, unit, status, timestamp
+        FROM sensor_data
+        WHERE sensor_id = $1 AND (timestamp, id) < ($2, $3)
+        ORDER BY timestamp DESC, id DESC
+        LIMIT $4
+    """
+    
+    SELECT_BY_STATUS_SQL = """
+        SELECT id, sensor_id, value, unit, status, timestamp
+        FROM sensor_data
+        WHERE status = $1
+        ORDER BY timestamp DESC, id DESC
+        LIMIT $2 OFFSET $3
+    """
+    
+    SELECT_BY_STATUS_AFTER_SQL = """
+        SELECT id, sensor_id, value, unit, status, timestamp
+        FROM sensor_data
+        WHERE status = $1 AND (timestamp, id) < ($2, $3)
+        ORDER BY timestamp DESC, id DESC
+        LIMIT $4
+    """
+    
+    # The page is cut from sensor_data first, so sensors and units are joined only for the
+    # rows returned rather than for every row an OFFSET skips. The foreign keys guarantee
+    # every row has a sensor and a unit, so the inner joins drop nothing
+    SELECT_WITH_DETAILS_SQL = """
+        SELECT 
+            sd.id,
+            sd.sensor_id,
+            sd.value,
+            sd.unit,
+            sd.status,
+            sd.timestamp,
+            s.name as sensor_name,
+            s.sensor_type,
+            u.name as unit_name
+        FROM (
+            SELECT id, sensor_id, value, unit, status, timestamp
+            FROM sensor_data
+            ORDER BY timestamp DESC, id DESC
+            LIMIT $1 OFFSET $2
+        ) sd
+        JOIN sensors s ON sd.sensor_id = s.id
+        JOIN units u ON s.unit_id = u.id
+        ORDER BY sd.timestamp DESC, sd.id DESC
+    """
+    
+    SELECT_WITH_DETAILS_AFTER_SQL = """
+        SELECT 
+            sd.id,
+            sd.sensor_id,
+            sd.value,
+            sd.unit,
+            sd.status,
+            sd.timestamp,
+            s.name as sensor_name,
+            s.sensor_type,
+            u.name as unit_name
+        FROM (
+            SELECT id, sensor_id, value, unit, status, timestamp
+            FROM sensor_data
+            WHERE (timestamp, id) < ($1, $2)
+            ORDER BY timestamp DESC, id DESC
+            LIMIT $3
+        ) sd
+        JOIN sensors s ON sd.sensor_id = s.id
+        JOIN units u ON s.unit_id = u.id
+        ORDER BY sd.timestamp DESC, sd.id DESC
+    """
+    
+    DELETE_SQL = "DELETE FROM sensor_data WHERE id = $1 RETURNING id"
+    
+    # Defined by the partitioning migration; creates any missing monthly partitions
+    ENSURE_PARTITIONS_SQL = "SELECT ensure_sensor_data_partitions($1)"
+    
+    # NULL parameters leave their column unchanged
+    UPDATE_SQL = """
+        UPDATE sensor_data
+        SET value  = COALESCE($1, value),
+            unit   = COALESCE($2, unit),
+            status = COALESCE($3, status)
+        WHERE id = $4
+        RETURNING id, sensor_id, value, unit, status, timestamp
+    """
+    
+    HOT_STATEMENTS = (
+        INSERT_SQL, SELECT_BY_ID_SQL, SELECT_ALL_SQL, UPDATE_SQL,
+        DELETE_SQL, TRANSITION_STATUS_SQL
+    )
+    
+    async def create(self, sensor_data: SensorDataCreate) -> Optional[Mapping[str, Any]]:
+        """Create a new sensor data entry, returning None if the sensor does not exist"""
         record = await self.fetch_one(
-            query,
+            self.INSERT_SQL,
             sensor_data.sensor_id,
             sensor_data.value,
             sensor_data.unit,
-            sensor_data.status.value
+            sensor_data.status.to_int()
         )
-        return self.record_to_dict(record)
+        return self.decode_record(record)
     
-    async def get_by_id(self, data_id: int) -> Optional[Dict]:
+    async def create_many(self, items: List[SensorDataCreate]) -> int:
+        """Bulk insert sensor data entries"""
+        records = [
+            (item.sensor_id, item.value, item.unit, item.status.to_int())
+            for item in items
+        ]
+        inserted = await self.copy_records(
+            "sensor_data",
+            records,
+            ["sensor_id", "value", "unit", "status"]
+        )
+        return inserted
+    
+    async def get_by_id(self, data_id: int) -> Optional[Mapping[str, Any]]:
         """Get sensor data by ID"""
-        query = """
-            SELECT id, sensor_id, value, unit, status, timestamp
-            FROM sensor_data
-            WHERE id = $1
-        """
-        record = await self.fetch_one(query, data_id)
-        return self.record_to_dict(record)
+        record = await self.fetch_one(self.SELECT_BY_ID_SQL, data_id)
+        return self.decode_record(record)
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Dict]:
-        """Get all sensor data with pagination"""
-        query = """
-            SELECT id, sensor_id, value, unit, status, timestamp
-            FROM sensor_data
-            ORDER BY timestamp DESC
-            LIMIT $1 OFFSET $2
-        """
-        records = await self.fetch_all(query, limit, skip)
-        return self.records_to_list(records)
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None
+    ) -> List[Mapping[str, Any]]:
+        """Get all sensor data, paginated by keyset when `after` is given, otherwise by offset"""
+        if after is not None:
+            records = await self.fetch_all(self.SELECT_ALL_AFTER_SQL, *after, limit)
+        else:
+            records = await self.fetch_all(self.SELECT_ALL_SQL, limit, skip)
+        return self.decode_records(records)
     
-    async def get_by_sensor_id(self, sensor_id: int, skip: int = 0, limit: int = 100) -> List[Dict]:
+    async def get_by_sensor_id(
+        self,
+        sensor_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None
+    ) -> List[Mapping[str, Any]]:
         """Get all data for a specific sensor"""
-        query = """
-            SELECT id, sensor_id, value, unit, status, timestamp
-            FROM sensor_data
-            WHERE sensor_id = $1
-            ORDER BY timestamp DESC
-            LIMIT $2 OFFSET $3
-        """
-        records = await self.fetch_all(query, sensor_id, limit, skip)
-        return self.records_to_list(records)
+        if after is not None:
+            records = await self.fetch_all(self.SELECT_BY_SENSOR_ID_AFTER_SQL, sensor_id, *after, limit)
+        else:
+            records = await self.fetch_all(self.SELECT_BY_SENSOR_ID_SQL, sensor_id, limit, skip)
+        return self.decode_records(records)
     
-    async def get_by_status(self, status: DataStatus, skip: int = 0, limit: int = 100) -> List[Dict]:
+    async def get_by_status(
+        self,
+        status: DataStatus,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None
+    ) -> List[Mapping[str, Any]]:
         """Get all data by status"""
-        query = """
-            SELECT id, sensor_id, value, unit, status, timestamp
-            FROM sensor_data
-            WHERE status = $1
-            ORDER BY timestamp DESC
-            LIMIT $2 OFFSET $3
-        """
-        records = await self.fetch_all(query, status.value, limit, skip)
-        return self.records_to_list(records)
+        if after is not None:
+            records = await self.fetch_all(self.SELECT_BY_STATUS_AFTER_SQL, status.to_int(), *after, limit)
+        else:
+            records = await self.fetch_all(self.SELECT_BY_STATUS_SQL, status.to_int(), limit, skip)
+        return self.decode_records(records)
     
-    async def get_with_details(self, skip: int = 0, limit: int = 100) -> List[Dict]:
+    async def get_with_details(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None
+    ) -> List[Mapping[str, Any]]:
         """Get sensor data with sensor and unit details"""
-        query = """
-            SELECT 
-                sd.id,
-                sd.sensor_id,
-                sd.value,
-                sd.unit,
-                sd.status,
-                sd.timestamp,
-                s.name as sensor_name,
-                s.sensor_type,
-                u.name as unit_name
-            FROM sensor_data sd
-            JOIN sensors s ON sd.sensor_id = s.id
-            JOIN units u ON s.unit_id = u.id
-            ORDER BY sd.timestamp DESC
-            LIMIT $1 OFFSET $2
-        """
-        records = await self.fetch_all(query, limit, skip)
-        return self.records_to_list(records)
+        if after is not None:
+            records = await self.fetch_all(self.SELECT_WITH_DETAILS_AFTER_SQL, *after, limit)
+        else:
+            records = await self.fetch_all(self.SELECT_WITH_DETAILS_SQL, limit, skip)
+        return self.decode_records(records)
     
-    async def update(self, data_id: int, sensor_data: SensorDataUpdate) -> Optional[Dict]:
+    async def stream(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        with_details: bool = False
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """Stream sensor data, newest first, without materializing the whole page"""
+        query = self.SELECT_WITH_DETAILS_SQL if with_details else self.SELECT_ALL_SQL
+        async for record in self.iterate(query, limit, skip):
+            yield self.decode_record(record)
+    
+    async def ensure_partitions(self, months_ahead: int) -> None:
+        """Create the monthly partitions from the current month through `months_ahead` months ahead"""
+        await self.execute(self.ENSURE_PARTITIONS_SQL, months_ahead)
+    
+    async def update(self, data_id: int, sensor_data: SensorDataUpdate) -> Optional[Mapping[str, Any]]:
         """Update sensor data"""
-        update_fields = []
-        values = []
-        param_count = 1
-        
-        if sensor_data.value is not None:
-            update_fields.append(f"value = ${param_count}")
-            values.append(sensor_data.value)
-            param_count += 1
-        
-        if sensor_data.unit is not None:
-            update_fields.append(f"unit = ${param_count}")
-            values.append(sensor_data.unit)
-            param_count += 1
-        
-        if sensor_data.status is not None:
-            update_fields.append(f"status = ${param_count}")
-            values.append(sensor_data.status.value)
-            param_count += 1
-        
-        if not update_fields:
+        values = (
+            sensor_data.value,
+            sensor_data.unit,
+            sensor_data.status.to_int() if sensor_data.status is not None else None
+        )
+        if all(value is None for value in values):
             return await self.get_by_id(data_id)
         
-        values.append(data_id)
-        query = f"""
-            UPDATE sensor_data
-            SET {', '.join(update_fields)}
-            WHERE id = ${param_count}
-            RETURNING id, sensor_id, value, unit, status, timestamp
-        """
-        
-        record = await self.fetch_one(query, *values)
-        return self.record_to_dict(record)
+        record = await self.fetch_one(self.UPDATE_SQL, *values, data_id)
+        return self.decode_record(record)
     
-    async def validate(self, data_id: int) -> Optional[Dict]:
-        """Mark sensor data as validated"""
-        query = """
-            UPDATE sensor_data
-            SET status = $1
-            WHERE id = $2
-            RETURNING id, sensor_id, value, unit, status, timestamp
+    async def transition_status(
+        self,
+        data_id: int,
+        new_status: DataStatus,
+        blocked_statuses: List[DataStatus]
+    ) -> Optional[Mapping[str, Any]]:
         """
-        record = await self.fetch_one(query, DataStatus.VALIDATED.value, data_id)
-        return self.record_to_dict(record)
-    
-    async def archive(self, data_id: int) -> Optional[Dict]:
-        """Mark sensor data as archived"""
-        query = """
-            UPDATE sensor_data
-            SET status = $1
-            WHERE id = $2
-            RETURNING id, sensor_id, value, unit, status, timestamp
+        Set the status of sensor data in one round trip, unless it is currently in blocked_statuses.
+        Returns None if the entry does not exist; otherwise the row plus its previous_status,
+        with a NULL id when the transition was blocked.
         """
-        record = await self.fetch_one(query, DataStatus.ARCHIVED.value, data_id)
-        return self.record_to_dict(record)
-    
-    async def delete(self, data_id: int) -> bool:
-        """Delete sensor data"""
-        query = "DELETE FROM sensor_data WHERE id = $1"
-        result = await self.execute(query, data_id)
-        return result == "DELETE 1"
+        record = await self.fetch_one(
+            self.TRANSITION_STATUS_SQL,
+            new_status.to_int(),
+            data_id,
+            [blocked.to_int() for blocked in blocked_statuses]
+        )
+        return self.decode_record(record)
+    
+    async def validate(self, data_id: int) -> Optional[Mapping[str, Any]]:
+        """Mark sensor data as validated unless it is already validated or archived"""
+        return await self.transition_status(
+            data_id, DataStatus.VALIDATED, [DataStatus.VALIDATED, DataStatus.ARCHIVED]
+        )
+    
+    async def archive(self, data_id: int) -> Optional[Mapping[str, Any]]:
+        """Mark sensor data as archived unless it is already archived"""
+        return await self.transition_status(data_id, DataStatus.ARCHIVED, [DataStatus.ARCHIVED])
+    
+    async def delete(self, data_id: int) -> Optional[int]:
+        """Delete sensor data, returning its id, or None if it did not exist"""
+        deleted_id = await self.fetch_val(self.DELETE_SQL, data_id)
+        return deleted_id
@@ -1,108 +1,103 @@
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Mapping
 from app.repositories.base import BaseRepository
-from app.models import SensorCreate, SensorUpdate
+from app.repositories.cache import async_ttl_cache
+from app.models import SensorCreate, SensorUpdate, SensorType, SensorStatus
 
 
 class SensorRepository(BaseRepository):
     """Repository for Sensor entity operations"""
     
-    async def create(self, sensor: SensorCreate) -> Dict:
-        """Create a new sensor"""
-        query = """
-            INSERT INTO sensors (name, sensor_type, unit_id, status, description)
-            VALUES ($1, $2, $3, $4, $5)
-            RETURNING id, name, sensor_type, unit_id, status, description, created_at
-        """
+    CODED_COLUMNS = {"sensor_type": SensorType, "status": SensorStatus}
+    
+    # Inserts nothing, instead of failing on the foreign key, when the unit does not exist
+    INSERT_SQL = """
+        INSERT INTO sensors (name, sensor_type, unit_id, status, description)
+        SELECT $1, $2, $3, $4, $5
+        WHERE EXISTS (SELECT 1 FROM units WHERE id = $3)
+        RETURNING id, name, sensor_type, unit_id, status, description, created_at
+    """
+    
+    SELECT_BY_ID_SQL = """
+        SELECT id, name, sensor_type, unit_id, status, description, created_at
+        FROM sensors
+        WHERE id = $1
+    """
+    
+    SELECT_ALL_SQL = """
+        SELECT id, name, sensor_type, unit_id, status, description, created_at
+        FROM sensors
+        ORDER BY created_at DESC
+        LIMIT $1 OFFSET $2
+    """
+    
+    SELECT_BY_UNIT_ID_SQL = """
+        SELECT id, name, sensor_type, unit_id, status, description, created_at
+        FROM sensors
+        WHERE unit_id = $1
+        ORDER BY created_at DESC
+        LIMIT $2 OFFSET $3
+    """
+    
+    DELETE_SQL = "DELETE FROM sensors WHERE id = $1"
+    
+    # NULL parameters leave their column unchanged
+    UPDATE_SQL = """
+        UPDATE sensors
+        SET name        = COALESCE($1, name),
+            sensor_type = COALESCE($2, sensor_type),
+            status      = COALESCE($3, status),
+            description = COALESCE($4, description)
+        WHERE id = $5
+        RETURNING id, name, sensor_type, unit_id, status, description, created_at
+    """
+    
+    HOT_STATEMENTS = (INSERT_SQL, SELECT_BY_ID_SQL, SELECT_ALL_SQL, UPDATE_SQL, DELETE_SQL)
+    
+    async def create(self, sensor: SensorCreate) -> Optional[Mapping[str, Any]]:
+        """Create a new sensor, returning None if the unit does not exist"""
         record = await self.fetch_one(
-            query,
+            self.INSERT_SQL,
             sensor.name,
-            sensor.sensor_type.value,
+            sensor.sensor_type.to_int(),
             sensor.unit_id,
-            sensor.status.value,
+            sensor.status.to_int(),
             sensor.description
         )
-        return self.record_to_dict(record)
+        return self.decode_record(record)
     
-    async def get_by_id(self, sensor_id: int) -> Optional[Dict]:
+    @async_ttl_cache(maxsize=1024, ttl=30)
+    async def get_by_id(self, sensor_id: int) -> Optional[Mapping[str, Any]]:
         """Get sensor by ID"""
-        query = """
-            SELECT id, name, sensor_type, unit_id, status, description, created_at
-            FROM sensors
-            WHERE id = $1
-        """
-        record = await self.fetch_one(query, sensor_id)
-        return self.record_to_dict(record)
+        record = await self.fetch_one(self.SELECT_BY_ID_SQL, sensor_id)
+        return self.decode_record(record)
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Dict]:
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Mapping[str, Any]]:
         """Get all sensors with pagination"""
-        query = """
-            SELECT id, name, sensor_type, unit_id, status, description, created_at
-            FROM sensors
-            ORDER BY created_at DESC
-            LIMIT $1 OFFSET $2
-        """
-        records = await self.fetch_all(query, limit, skip)
-        return self.records_to_list(records)
+        records = await self.fetch_all(self.SELECT_ALL_SQL, limit, skip)
+        return self.decode_records(records)
     
-    async def get_by_unit_id(self, unit_id: int, skip: int = 0, limit: int = 100) -> List[Dict]:
+    async def get_by_unit_id(self, unit_id: int, skip: int = 0, limit: int = 100) -> List[Mapping[str, Any]]:
         """Get all sensors for a specific unit"""
-        query = """
-            SELECT id, name, sensor_type, unit_id, status, description, created_at
-            FROM sensors
-            WHERE unit_id = $1
-            ORDER BY created_at DESC
-            LIMIT $2 OFFSET $3
-        """
-        records = await self.fetch_all(query, unit_id, limit, skip)
-        return self.records_to_list(records)
+        records = await self.fetch_all(self.SELECT_BY_UNIT_ID_SQL, unit_id, limit, skip)
+        return self.decode_records(records)
     
-    async def update(self, sensor_id: int, sensor: SensorUpdate) -> Optional[Dict]:
+    async def update(self, sensor_id: int, sensor: SensorUpdate) -> Optional[Mapping[str, Any]]:
         """Update a sensor"""
-        update_fields = []
-        values = []
-        param_count = 1
-        
-        if sensor.name is not None:
-            update_fields.append(f"name = ${param_count}")
-            values.append(sensor.name)
-            param_count += 1
-        
-        if sensor.sensor_type is not None:
-            update_fields.append(f"sensor_type = ${param_count}")
-            values.append(sensor.sensor_type.value)
-            param_count += 1
-        
-        if sensor.status is not None:
-            update_fields.append(f"status = ${param_count}")
-            values.append(sensor.status.value)
-            param_count += 1
-        
-        if sensor.description is not None:
-            update_fields.append(f"description = ${param_count}")
-            values.append(sensor.description)
-            param_count += 1
-        
-        if not update_fields:
+        values = (
+            sensor.name,
+            sensor.sensor_type.to_int() if sensor.sensor_type is not None else None,
+            sensor.status.to_int() if sensor.status is not None else None,
+            sensor.description
+        )
+        if all(value is None for value in values):
             return await self.get_by_id(sensor_id)
         
-        values.append(sensor_id)
-        query = f"""
-            UPDATE sensors
-            SET {', '.join(update_fields)}
-            WHERE id = ${param_count}
-            RETURNING id, name, sensor_type, unit_id, status, description, created_at
-        """
-        
-        record = await self.fetch_one(query, *values)
-        return self.record_to_dict(record)
+        record = await self.fetch_one(self.UPDATE_SQL, *values, sensor_id)
+        self.get_by_id.cache.pop(sensor_id)
+        return self.decode_record(record)
     
     async def delete(self, sensor_id: int) -> bool:
-        """Delete a sensor"""
-        query = "DELETE FROM sensors WHERE id = $1"
-        result = await self.execute(query, sensor_id)
-        return result == "DELETE 1"
-    
-    async def exists_for_unit(self, unit_id: int) -> bool:
-        """Check if unit has any sensors"""
-        query = "SELECT EXISTS(SELECT 1 FROM sensors WHERE unit_id = $1)"
-        return await self.fetch_val(query, unit_id)
+        """Delete a sensor in one statement, returning whether it existed"""
+        result = await self.execute(self.DELETE_SQL, sensor_id)
+        self.get_by_id.cache.pop(sensor_id)
+        return result == "DELETE 1"
\ No newline at end of file
@@ -1,105 +1,156 @@
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Mapping
+from app.database import DatabasePool
 from app.repositories.base import BaseRepository
-from app.models import UnitCreate, UnitUpdate
+from app.repositories.cache import async_ttl_cache
+from app.repositories.sensor_repository import SensorRepository
+from app.models import UnitCreate, UnitUpdate, SensorStatus
 
 
 class UnitRepository(BaseRepository):
     """Repository for Unit entity operations"""
     
-    async def create(self, unit: UnitCreate) -> Dict:
+    INSERT_SQL = """
+        INSERT INTO units (name, location, description)
+        VALUES ($1, $2, $3)
+        RETURNING id, name, location, description, created_at
+    """
+    
+    SELECT_BY_ID_SQL = """
+        SELECT id, name, location, description, created_at
+        FROM units
+        WHERE id = $1
+    """
+    
+    SELECT_ALL_SQL = """
+        SELECT id, name, location, description, created_at
+        FROM units
+        ORDER BY created_at DESC
+        LIMIT $1 OFFSET $2
+    """
+    
+    DELETE_SQL = "DELETE FROM units WHERE id = $1"
+    
+    # NULL parameters leave their column unchanged
+    UPDATE_SQL = """
+        UPDATE units
+        SET name        = COALESCE($1, name),
+            location    = COALESCE($2, location),
+            description = COALESCE($3, description)
+        WHERE id = $4
+        RETURNING id, name, location, description, created_at
+    """
+    
+    SELECT_STATISTICS_SQL = """
+        SELECT unit_id, unit_name, total_sensors, active_sensors, inactive_sensors,
+               total_data_points, latest_data_timestamp
+        FROM unit_statistics
+        WHERE unit_id = $1
+    """
+    
+    # Sensors and sensor data are aggregated separately and then joined, so the
+    # sensors x sensor_data product is never materialized
+    COMPUTE_STATISTICS_SQL = """
+        SELECT
+            u.id AS unit_id,
+            u.name AS unit_name,
+            s_stats.total_sensors,
+            s_stats.active_sensors,
+            s_stats.inactive_sensors,
+            d_stats.total_data_points,
+            d_stats.latest_data_timestamp
+        FROM units u
+        LEFT JOIN LATERAL (
+            SELECT
+                COUNT(*) AS total_sensors,
+                COUNT(*) FILTER (WHERE status = $2) AS active_sensors,
+                COUNT(*) FILTER (WHERE status = $3) AS inactive_sensors
+            FROM sensors
+            WHERE unit_id = u.id
+        ) s_stats ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT COUNT(*) AS total_data_points, MAX(sd.timestamp) AS latest_data_timestamp
+            FROM sensor_data sd
+            JOIN sensors s ON s.id = sd.sensor_id
+            WHERE s.unit_id = u.id
+        ) d_stats ON TRUE
+        WHERE u.id = $1
+    """
+    
+    REFRESH_STATISTICS_SQL = "REFRESH MATERIALIZED VIEW CONCURRENTLY unit_statistics"
+    
+    # Held for the refresh's transaction, so only one process refreshes at a time
+    TRY_REFRESH_LOCK_SQL = "SELECT pg_try_advisory_xact_lock(hashtext('refresh_unit_statistics'))"
+    
+    HOT_STATEMENTS = (INSERT_SQL, SELECT_BY_ID_SQL, SELECT_ALL_SQL, UPDATE_SQL, DELETE_SQL)
+    
+    async def create(self, unit: UnitCreate) -> Mapping[str, Any]:
         """Create a new unit"""
-        query = """
-            INSERT INTO units (name, location, description)
-            VALUES ($1, $2, $3)
-            RETURNING id, name, location, description, created_at
-        """
         record = await self.fetch_one(
-            query,
+            self.INSERT_SQL,
             unit.name,
             unit.location,
             unit.description
         )
-        return self.record_to_dict(record)
+        return self.decode_record(record)
     
-    async def get_by_id(self, unit_id: int) -> Optional[Dict]:
+    @async_ttl_cache(maxsize=1024, ttl=30)
+    async def get_by_id(self, unit_id: int) -> Optional[Mapping[str, Any]]:
         """Get unit by ID"""
-        query = """
-            SELECT id, name, location, description, created_at
-            FROM units
-            WHERE id = $1
-        """
-        record = await self.fetch_one(query, unit_id)
-        return self.record_to_dict(record)
+        record = await self.fetch_one(self.SELECT_BY_ID_SQL, unit_id)
+        return self.decode_record(record)
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Dict]:
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Mapping[str, Any]]:
         """Get all units with pagination"""
-        query = """
-            SELECT id, name, location, description, created_at
-            FROM units
-            ORDER BY created_at DESC
-            LIMIT $1 OFFSET $2
-        """
-        records = await self.fetch_all(query, limit, skip)
-        return self.records_to_list(records)
+        records = await self.fetch_all(self.SELECT_ALL_SQL, limit, skip)
+        return self.decode_records(records)
     
-    async def update(self, unit_id: int, unit: UnitUpdate) -> Optional[Dict]:
+    async def update(self, unit_id: int, unit: UnitUpdate) -> Optional[Mapping[str, Any]]:
         """Update a unit"""
-        # Build dynamic update query based on provided fields
-        update_fields = []
-        values = []
-        param_count = 1
-        
-        if unit.name is not None:
-            update_fields.append(f"name = ${param_count}")
-            values.append(unit.name)
-            param_count += 1
-        
-        if unit.location is not None:
-            update_fields.append(f"location = ${param_count}")
-            values.append(unit.location)
-            param_count += 1
-        
-        if unit.description is not None:
-            update_fields.append(f"description = ${param_count}")
-            values.append(unit.description)
-            param_count += 1
-        
-        if not update_fields:
+        values = (unit.name, unit.location, unit.description)
+        if all(value is None for value in values):
             return await self.get_by_id(unit_id)
         
-        values.append(unit_id)
-        query = f"""
-            UPDATE units
-            SET {', '.join(update_fields)}
-            WHERE id = ${param_count}
-            RETURNING id, name, location, description, created_at
-        """
-        
-        record = await self.fetch_one(query, *values)
-        return self.record_to_dict(record)
+        record = await self.fetch_one(self.UPDATE_SQL, *values, unit_id)
+        self.get_by_id.cache.pop(unit_id)
+        return self.decode_record(record)
     
     async def delete(self, unit_id: int) -> bool:
-        """Delete a unit"""
-        query = "DELETE FROM units WHERE id = $1"
-        result = await self.execute(query, unit_id)
+        """Delete a unit in one statement, returning whether it existed"""
+        result = await self.execute(self.DELETE_SQL, unit_id)
+        self.get_by_id.cache.pop(unit_id)
+        self.get_statistics.cache.pop(unit_id)
+        # Deleting a unit cascades to its sensors and their data
+        SensorRepository.get_by_id.cache.clear()
         return result == "DELETE 1"
     
-    async def get_statistics(self, unit_id: int) -> Optional[Dict]:
-        """Get statistics for a specific unit"""
-        query = """
-            SELECT 
-                u.id as unit_id,
-                u.name as unit_name,
-                COUNT(DISTINCT s.id) as total_sensors,
-                COUNT(DISTINCT CASE WHEN s.status = 'active' THEN s.id END) as active_sensors,
-                COUNT(DISTINCT CASE WHEN s.status = 'inactive' THEN s.id END) as inactive_sensors,
-                COUNT(sd.id) as total_data_points,
-                MAX(sd.timestamp) as latest_data_timestamp
-            FROM units u
-            LEFT JOIN sensors s ON s.unit_id = u.id
-            LEFT JOIN sensor_data sd ON sd.sensor_id = s.id
-            WHERE u.id = $1
-            GROUP BY u.id, u.name
+    # The view is itself a periodic snapshot, so caching it briefly adds little staleness
+    @async_ttl_cache(maxsize=1024, ttl=10)
+    async def get_statistics(self, unit_id: int) -> Optional[Mapping[str, Any]]:
+        """Get statistics for a unit from the materialized view, computing them live if absent"""
+        record = await self.fetch_one(self.SELECT_STATISTICS_SQL, unit_id)
+        if record is not None:
+            return self.decode_record(record)
+        return await self.compute_statistics(unit_id)
+    
+    async def compute_statistics(self, unit_id: int) -> Optional[Mapping[str, Any]]:
+        """Aggregate statistics for a specific unit from the base tables"""
+        record = await self.fetch_one(
+            self.COMPUTE_STATISTICS_SQL,
+            unit_id,
+            SensorStatus.active.to_int(),
+            SensorStatus.inactive.to_int()
+        )
+        return self.decode_record(record)
+    
+    async def refresh_statistics(self) -> bool:
+        """
+        Refresh the unit_statistics materialized view without blocking readers.
+        Every API process runs this on a timer; whichever takes the advisory lock first does
+        the refresh and the others skip it, returning False.
         """
-        record = await self.fetch_one(query, unit_id)
-        return self.record_to_dict(record)
+        async with DatabasePool.transaction() as connection:
+            if not await connection.fetchval(self.TRY_REFRESH_LOCK_SQL):
+                return False
+            await connection.execute(self.REFRESH_STATISTICS_SQL)
+        self.get_statistics.cache.clear()
+        return True
@@ -0,0 +1,50 @@
+import hashlib
+from typing import Any, Mapping, Optional
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+
+def model_response(
+    adapter: TypeAdapter,
+    content: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Serialize models built from trusted database rows straight to JSON bytes.
+    Returning a Response skips FastAPI's response_model pass, which would re-validate every row;
+    the route's response_model still documents the schema.
+    """
+    return Response(
+        content=adapter.dump_json(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json"
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names the current ETag"""
+    if not if_none_match:
+        return False
+    return any(
+        candidate.strip().removeprefix("W/") in (etag, "*")
+        for candidate in if_none_match.split(",")
+    )
+
+
+def etag_model_response(
+    request: Request,
+    adapter: TypeAdapter,
+    content: Any,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    model_response tagged with a hash of its body.
+    Answers 304 with no body when the client's If-None-Match already names that hash.
+    """
+    body = adapter.dump_json(content)
+    headers = {**(headers or {}), "ETag": '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, headers=headers, media_type="application/json")
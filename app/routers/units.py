@@ -1,25 +1,22 @@
-from fastapi import APIRouter, Query, status, HTTPException,Body
-from typing import List
+from fastapi import APIRouter, Path, Query, Request, status, Body
+from typing import Annotated, List
+from pydantic import TypeAdapter
 from app.models import Unit, UnitCreate, UnitUpdate, UnitStatistics
-from app.services import UnitService
-from app.exceptions import (
-    NotFoundException,
-    BadRequestException,
-    ConflictException,
-    DatabaseException,
-    InternalServerException,
-    ValidationException
-)
+from app.services import unit_service as service
+from app.responses import etag_model_response
 from app.schemas.api_examples import (
     UNIT_EXAMPLE,
     UNIT_CREATE_DESCRIPTION,
     UNIT_RESPONSES
 )
-import logging
 
 router = APIRouter(prefix="/units", tags=["units"])
-logger = logging.getLogger(__name__)
 
+UnitId = Annotated[int, Path(gt=0, description="Unit ID")]
+
+UNIT_ADAPTER = TypeAdapter(Unit)
+UNIT_LIST_ADAPTER = TypeAdapter(List[Unit])
+UNIT_STATISTICS_ADAPTER = TypeAdapter(UnitStatistics)
 
 
 @router.post(
@@ -32,133 +29,46 @@ logger = logging.getLogger(__name__)
 )
 async def create_unit(unit: UnitCreate = Body(..., example=UNIT_EXAMPLE)):
     """Create a new unit"""
-    """Create a new unit"""
-    try:
-        service = UnitService()
-        return await service.create_unit(unit)
-    except ValueError as e:
-        logger.error(f"Validation error while creating unit: {str(e)}")
-        raise ValidationException(detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.critical(f"Unexpected error while creating unit: {str(e)}")
-        raise InternalServerException(detail="Failed to create unit")
+    return await service.create_unit(unit)
 
 
 @router.get("/", response_model=List[Unit])
 async def get_units(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of records to return")
 ):
     """Get all units with pagination"""
-    try:
-        if skip < 0:
-            raise BadRequestException(detail="Skip parameter must be non-negative")
-        if limit < 1 or limit > 100:
-            raise BadRequestException(detail="Limit must be between 1 and 100")
-        
-        service = UnitService()
-        return await service.get_all_units(skip, limit)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.critical(f"Unexpected error while fetching units: {str(e)}")
-        raise InternalServerException(detail="Failed to fetch units")
+    units = await service.get_all_units(skip, limit)
+    return etag_model_response(request, UNIT_LIST_ADAPTER, units)
 
 
 @router.get("/{unit_id}", response_model=Unit)
-async def get_unit(unit_id: int):
+async def get_unit(unit_id: UnitId, request: Request):
     """Get a specific unit by ID"""
-    try:
-        if unit_id <= 0:
-            raise BadRequestException(detail="Unit ID must be positive")
-        
-        service = UnitService()
-        unit = await service.get_unit(unit_id)
-        
-        if not unit:
-            raise NotFoundException(resource_name="Unit", resource_id=unit_id)
-        
-        return unit
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.critical(f"Unexpected error while fetching unit {unit_id}: {str(e)}")
-        raise InternalServerException(detail=f"Failed to fetch unit with id {unit_id}")
+    unit = await service.get_unit(unit_id)
+    return etag_model_response(request, UNIT_ADAPTER, unit)
 
 
 @router.put("/{unit_id}", response_model=Unit)
-async def update_unit(unit_id: int, unit: UnitUpdate):
+async def update_unit(unit_id: UnitId, unit: UnitUpdate):
     """Update a unit"""
-    try:
-        if unit_id <= 0:
-            raise BadRequestException(detail="Unit ID must be positive")
-        
-        service = UnitService()
-        
-        # Check if unit exists
-        existing_unit = await service.get_unit(unit_id)
-        if not existing_unit:
-            raise NotFoundException(resource_name="Unit", resource_id=unit_id)
-        
-        updated_unit = await service.update_unit(unit_id, unit)
-        return updated_unit
-    except HTTPException:
-        raise
-    except ValueError as e:
-        logger.error(f"Validation error while updating unit {unit_id}: {str(e)}")
-        raise ValidationException(detail=str(e))
-    except Exception as e:
-        logger.critical(f"Unexpected error while updating unit {unit_id}: {str(e)}")
-        raise InternalServerException(detail=f"Failed to update unit with id {unit_id}")
+    return await service.update_unit(unit_id, unit)
 
 
 @router.delete("/{unit_id}")
-async def delete_unit(unit_id: int):
+async def delete_unit(unit_id: UnitId):
     """Delete a unit"""
-    try:
-        if unit_id <= 0:
-            raise BadRequestException(detail="Unit ID must be positive")
-        
-        service = UnitService()
-        
-        # Check if unit exists
-        existing_unit = await service.get_unit(unit_id)
-        if not existing_unit:
-            raise NotFoundException(resource_name="Unit", resource_id=unit_id)
-        
-        result = await service.delete_unit(unit_id)
-        
-        return {
-            "message": f"Unit with id {unit_id} deleted successfully",
-            "deleted_id": unit_id
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.critical(f"Unexpected error while deleting unit {unit_id}: {str(e)}")
-        raise InternalServerException(detail=f"Failed to delete unit with id {unit_id}")
+    await service.delete_unit(unit_id)
+    
+    return {
+        "message": f"Unit with id {unit_id} deleted successfully",
+        "deleted_id": unit_id
+    }
 
 
 @router.get("/{unit_id}/statistics", response_model=UnitStatistics)
-async def get_unit_statistics(unit_id: int):
+async def get_unit_statistics(unit_id: UnitId, request: Request):
     """Get statistics for a specific unit"""
-    try:
-        if unit_id <= 0:
-            raise BadRequestException(detail="Unit ID must be positive")
-        
-        service = UnitService()
-        
-        # Check if unit exists
-        existing_unit = await service.get_unit(unit_id)
-        if not existing_unit:
-            raise NotFoundException(resource_name="Unit", resource_id=unit_id)
-        
-        statistics = await service.get_unit_statistics(unit_id)
-        return statistics
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.critical(f"Unexpected error while fetching statistics for unit {unit_id}: {str(e)}")
-        raise InternalServerException(detail=f"Failed to fetch statistics for unit {unit_id}")
\ No newline at end of file
+    statistics = await service.get_unit_statistics(unit_id)
+    return etag_model_response(request, UNIT_STATISTICS_ADAPTER, statistics)
\ No newline at end of file
@@ -137,4 +137,25 @@ SENSOR_DATA_RESPONSES = {
     },
     404: {"description": "Sensor not found"},
     422: {"description": "Validation error"}
-}
\ No newline at end of file
+}
+
+SENSOR_DATA_BULK_DESCRIPTION = """
+Record a batch of data points in a single request.
+
+Up to 10,000 entries are accepted per call. Large batches are loaded with
+PostgreSQL `COPY`, so prefer this endpoint over repeated single inserts
+when ingesting telemetry.
+"""
+
+SENSOR_DATA_BULK_RESPONSES = {
+    201: {
+        "description": "Sensor data batch created successfully",
+        "content": {
+            "application/json": {
+                "example": {"message": "Sensor data created successfully", "inserted": 2}
+            }
+        }
+    },
+    400: {"description": "One or more sensors not found"},
+    422: {"description": "Validation error"}
+}
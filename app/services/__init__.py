@@ -2,4 +2,16 @@ from app.services.unit_service import UnitService
 from app.services.sensor_service import SensorService
 from app.services.sensor_data_service import SensorDataService
 
-__all__ = ["UnitService", "SensorService", "SensorDataService"]
+# Services are stateless wrappers around repositories, so one instance of each serves every request
+unit_service = UnitService()
+sensor_service = SensorService()
+sensor_data_service = SensorDataService()
+
+__all__ = [
+    "UnitService",
+    "SensorService",
+    "SensorDataService",
+    "unit_service",
+    "sensor_service",
+    "sensor_data_service"
+]
@@ -0,0 +1,20 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+from app.exceptions import BadRequestException
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode the (timestamp, id) of the last row of a page as an opaque cursor"""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor back into (timestamp, id)"""
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BadRequestException(detail="Invalid pagination cursor")
@@ -1,8 +1,16 @@
 from typing import List, Optional
+import asyncpg
 from fastapi import HTTPException, status
-from app.repositories import SensorDataRepository, SensorRepository
+from pydantic import TypeAdapter
+from app.repositories import SensorDataRepository
 from app.models import SensorData, SensorDataCreate, SensorDataUpdate, DataStatus, SensorDataWithDetails
-from app.exceptions import NotFoundException, BadRequestException
+from app.exceptions import NotFoundException, BadRequestException, ConflictException
+from app.services.pagination import decode_cursor
+
+
+# Validating a whole page in one core call is cheaper than constructing models row by row
+_SENSOR_DATA_LIST_ADAPTER = TypeAdapter(List[SensorData])
+_SENSOR_DATA_DETAILS_LIST_ADAPTER = TypeAdapter(List[SensorDataWithDetails])
 
 
 class SensorDataService:
@@ -10,27 +18,32 @@ class SensorDataService:
     
     def __init__(self):
         self.repository = SensorDataRepository()
-        self.sensor_repository = SensorRepository()
     
     async def create_sensor_data(self, sensor_data: SensorDataCreate) -> SensorData:
         """Create a new sensor data entry"""
-        # Verify that sensor exists
-        sensor = await self.sensor_repository.get_by_id(sensor_data.sensor_id)
-        if not sensor:
+        data = await self.repository.create(sensor_data)
+        if data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Sensor with id {sensor_data.sensor_id} not found"
             )
+        return SensorData.model_construct(**data)
+    
+    async def create_sensor_data_bulk(self, items: List[SensorDataCreate]) -> dict:
+        """Create many sensor data entries in a single batch"""
+        try:
+            inserted = await self.repository.create_many(items)
+        except asyncpg.ForeignKeyViolationError:
+            raise BadRequestException(detail="One or more sensor_id values do not reference an existing sensor")
         
-        data = await self.repository.create(sensor_data)
-        return SensorData(**data)
+        return {"message": "Sensor data created successfully", "inserted": inserted}
     
     async def get_sensor_data(self, data_id: int) -> SensorData:
         """Get sensor data by ID"""
         data = await self.repository.get_by_id(data_id)
         if not data:
             raise NotFoundException(resource_name="Sensor data", resource_id=data_id)
-        return SensorData(**data)
+        return SensorData.model_construct(**data)
     
     async def get_all_sensor_data(
         self,
@@ -38,82 +51,62 @@ class SensorDataService:
         limit: int = 100,
         sensor_id: Optional[int] = None,
         status_filter: Optional[DataStatus] = None,
-        with_details: bool = False
+        with_details: bool = False,
+        cursor: Optional[str] = None
     ) -> List[SensorData] | List[SensorDataWithDetails]:
-        """Get all sensor data with optional filtering"""
-        if limit > 100:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Limit cannot exceed 100"
-            )
+        """Get all sensor data with optional filtering; a cursor switches from offset to keyset paging"""
+        after = decode_cursor(cursor) if cursor is not None else None
         
         if with_details:
-            data_list = await self.repository.get_with_details(skip, limit)
-            return [SensorDataWithDetails(**data) for data in data_list]
+            data_list = await self.repository.get_with_details(skip, limit, after)
+            return _SENSOR_DATA_DETAILS_LIST_ADAPTER.validate_python(data_list)
         
         if sensor_id is not None:
-            data_list = await self.repository.get_by_sensor_id(sensor_id, skip, limit)
+            data_list = await self.repository.get_by_sensor_id(sensor_id, skip, limit, after)
         elif status_filter is not None:
-            data_list = await self.repository.get_by_status(status_filter, skip, limit)
+            data_list = await self.repository.get_by_status(status_filter, skip, limit, after)
         else:
-            data_list = await self.repository.get_all(skip, limit)
+            data_list = await self.repository.get_all(skip, limit, after)
         
-        return [SensorData(**data) for data in data_list]
+        return _SENSOR_DATA_LIST_ADAPTER.validate_python(data_list)
+    
+    def stream_sensor_data(self, skip: int = 0, limit: int = 100, with_details: bool = False):
+        """Stream sensor data rows for large exports"""
+        return self.repository.stream(skip, limit, with_details)
     
     async def update_sensor_data(self, data_id: int, sensor_data: SensorDataUpdate) -> SensorData:
         """Update sensor data"""
-        # Check if data exists
-        existing_data = await self.repository.get_by_id(data_id)
-        if not existing_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Sensor data with id {data_id} not found"
-            )
-        
         data = await self.repository.update(data_id, sensor_data)
-        return SensorData(**data)
+        if not data:
+            raise NotFoundException(resource_name="Sensor data", resource_id=data_id)
+        return SensorData.model_construct(**data)
     
     async def validate_sensor_data(self, data_id: int) -> SensorData:
         """Validate sensor data"""
-        # Check if data exists
-        existing_data = await self.repository.get_by_id(data_id)
-        if not existing_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Sensor data with id {data_id} not found"
-            )
-        
         data = await self.repository.validate(data_id)
-        return SensorData(**data)
+        if not data:
+            raise NotFoundException(resource_name="Sensor data", resource_id=data_id)
+        
+        previous_status = data.pop("previous_status")
+        if data["id"] is None:
+            if previous_status == DataStatus.VALIDATED:
+                raise ConflictException(detail=f"Sensor data {data_id} is already validated")
+            raise ConflictException(detail=f"Cannot validate archived sensor data {data_id}")
+        return SensorData.model_construct(**data)
     
     async def archive_sensor_data(self, data_id: int) -> SensorData:
         """Archive sensor data"""
-        # Check if data exists
-        existing_data = await self.repository.get_by_id(data_id)
-        if not existing_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Sensor data with id {data_id} not found"
-            )
-        
         data = await self.repository.archive(data_id)
-        return SensorData(**data)
+        if not data:
+            raise NotFoundException(resource_name="Sensor data", resource_id=data_id)
+        
+        data.pop("previous_status")
+        if data["id"] is None:
+            raise ConflictException(detail=f"Sensor data {data_id} is already archived")
+        return SensorData.model_construct(**data)
     
-    async def delete_sensor_data(self, data_id: int) -> dict:
+    async def delete_sensor_data(self, data_id: int) -> None:
         """Delete sensor data"""
-        # Check if data exists
-        existing_data = await self.repository.get_by_id(data_id)
-        if not existing_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Sensor data with id {data_id} not found"
-            )
-        
-        deleted = await self.repository.delete(data_id)
-        if not deleted:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete sensor data"
-            )
-        
-        return {"message": "Sensor data deleted successfully"}
+        deleted_id = await self.repository.delete(data_id)
+        if deleted_id is None:
+            raise NotFoundException(resource_name="Sensor data", resource_id=data_id)
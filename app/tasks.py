@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.config import settings
+from app.database import DatabasePool
+from app.repositories import UnitRepository, SensorDataRepository
+
+logger = logging.getLogger(__name__)
+
+# Result of the most recent database probe, served by the /health endpoint
+_database_health: Optional[dict] = None
+
+# A cached result older than this many probe intervals means the probe loop itself is stuck
+STALE_AFTER_INTERVALS = 3
+
+
+async def _select_one():
+    async with DatabasePool.get_pool().acquire() as conn:
+        await conn.fetchval("SELECT 1")
+
+
+async def probe_database() -> dict:
+    """Run a SELECT 1 against the pool, within the health check timeout, and cache the outcome"""
+    global _database_health
+    try:
+        await asyncio.wait_for(_select_one(), timeout=settings.health_check_timeout_seconds)
+        _database_health = {"ok": True, "checked_at": time.time(), "error": None}
+    except asyncio.TimeoutError:
+        error = f"Database did not respond within {settings.health_check_timeout_seconds}s"
+        logger.error("Health check failed: %s", error)
+        _database_health = {"ok": False, "checked_at": time.time(), "error": error}
+    except Exception as e:
+        logger.error("Health check failed: %s", e)
+        _database_health = {"ok": False, "checked_at": time.time(), "error": str(e)}
+    return _database_health
+
+
+async def get_database_health() -> dict:
+    """Return the cached probe result, probing once if none is available yet"""
+    if _database_health is None:
+        return await probe_database()
+    if time.time() - _database_health["checked_at"] > STALE_AFTER_INTERVALS * settings.health_check_interval_seconds:
+        return {
+            "ok": False,
+            "checked_at": _database_health["checked_at"],
+            "error": "No health probe has completed recently"
+        }
+    return _database_health
+
+
+async def probe_database_periodically(interval: float):
+    """Refresh the cached database health every `interval` seconds"""
+    while True:
+        await probe_database()
+        await asyncio.sleep(interval)
+
+
+async def refresh_unit_statistics_periodically(interval: float):
+    """Refresh the unit_statistics materialized view every `interval` seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if not await UnitRepository().refresh_statistics():
+                logger.debug("Unit statistics refresh skipped; another process is refreshing")
+        except Exception as e:
+            logger.error("Failed to refresh unit statistics: %s", e)
+
+
+async def create_sensor_data_partitions_periodically(interval: float, months_ahead: int):
+    """
+    Keep `months_ahead` monthly sensor_data partitions ready, checking every `interval` seconds.
+    Without this, rows from months past the last partition pile up in sensor_data_default.
+    """
+    while True:
+        try:
+            await SensorDataRepository().ensure_partitions(months_ahead)
+        except Exception as e:
+            logger.error("Failed to create sensor data partitions: %s", e)
+        await asyncio.sleep(interval)
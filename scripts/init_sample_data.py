@@ -1,78 +1,73 @@
 import asyncio
 import asyncpg
 import os
-from pathlib import Path
+import sys
 
-# Get settings from environment
-DATABASE_HOST = os.getenv("DATABASE_HOST", "localhost")
-DATABASE_PORT = int(os.getenv("DATABASE_PORT", 5432))
-DATABASE_USER = os.getenv("DATABASE_USER", "iot_user")
-DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD", "1245")
-DATABASE_NAME = os.getenv("DATABASE_NAME", "iot_sensors")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.models import SensorType, SensorStatus, DataStatus
+
+
+# One statement seeds every table: each CTE feeds the generated ids to the next insert,
+# and nothing is written once any unit exists, so re-runs cost a single round trip
+SEED_SQL = """
+    WITH new_units AS (
+        INSERT INTO units (name, location, description)
+        SELECT name, location, description
+        FROM (VALUES
+            ('Factory A', 'Building 1, Floor 2', 'Main production unit'),
+            ('Warehouse B', 'Building 3', 'Storage facility')
+        ) AS unit (name, location, description)
+        WHERE NOT EXISTS (SELECT 1 FROM units)
+        RETURNING id, name
+    ),
+    new_sensors AS (
+        INSERT INTO sensors (name, sensor_type, unit_id, status, description)
+        SELECT sensor.name, sensor.sensor_type, new_units.id, sensor.status, sensor.description
+        FROM (VALUES
+            ('Temperature Sensor 1', $1::smallint, 'Factory A', $4::smallint, 'Monitors room temperature'),
+            ('Humidity Sensor 1', $2::smallint, 'Factory A', $4::smallint, 'Monitors air humidity'),
+            ('Pressure Sensor 1', $3::smallint, 'Warehouse B', $5::smallint, 'Monitors air pressure')
+        ) AS sensor (name, sensor_type, unit_name, status, description)
+        JOIN new_units ON new_units.name = sensor.unit_name
+        RETURNING id, name
+    )
+    INSERT INTO sensor_data (sensor_id, value, unit, status)
+    SELECT new_sensors.id, data.value, data.unit, data.status
+    FROM (VALUES
+        ('Temperature Sensor 1', 23.5, 'celsius', $6::smallint),
+        ('Temperature Sensor 1', 24.1, 'celsius', $6::smallint),
+        ('Humidity Sensor 1', 65.0, 'percent', $7::smallint)
+    ) AS data (sensor_name, value, unit, status)
+    JOIN new_sensors ON new_sensors.name = data.sensor_name
+"""
 
 
 async def init_data():
     """Initialize sample data"""
-    conn = await asyncpg.connect(
-        host=DATABASE_HOST,
-        port=DATABASE_PORT,
-        user=DATABASE_USER,
-        password=DATABASE_PASSWORD,
-        database=DATABASE_NAME
-    )
+    # Same parsed-once settings and DSN as the API; JIT only slows down tiny inserts like these
+    conn = await asyncpg.connect(dsn=settings.database_url, server_settings={"jit": "off"})
     
     try:
-        # Check if data already exists
-        count = await conn.fetchval("SELECT COUNT(*) FROM units")
-        if count > 0:
-            print("✅ Sample data already exists")
-            return
-        
-        # Insert sample units
-        unit1_id = await conn.fetchval("""
-            INSERT INTO units (name, location, description)
-            VALUES ('Factory A', 'Building 1, Floor 2', 'Main production unit')
-            RETURNING id
-        """)
-        
-        unit2_id = await conn.fetchval("""
-            INSERT INTO units (name, location, description)
-            VALUES ('Warehouse B', 'Building 3', 'Storage facility')
-            RETURNING id
-        """)
-        
-        # Insert sample sensors
-        sensor1_id = await conn.fetchval("""
-            INSERT INTO sensors (name, sensor_type, unit_id, status, description)
-            VALUES ('Temperature Sensor 1', 'temperature', $1, 'active', 'Monitors room temperature')
-            RETURNING id
-        """, unit1_id)
-        
-        sensor2_id = await conn.fetchval("""
-            INSERT INTO sensors (name, sensor_type, unit_id, status, description)
-            VALUES ('Humidity Sensor 1', 'humidity', $1, 'active', 'Monitors air humidity')
-            RETURNING id
-        """, unit1_id)
-        
-        await conn.fetchval("""
-            INSERT INTO sensors (name, sensor_type, unit_id, status, description)
-            VALUES ('Pressure Sensor 1', 'pressure', $1, 'inactive', 'Monitors air pressure')
-            RETURNING id
-        """, unit2_id)
-        
-        # Insert sample sensor data
-        await conn.execute("""
-            INSERT INTO sensor_data (sensor_id, value, unit, status)
-            VALUES 
-                ($1, 23.5, 'celsius', 'validated'),
-                ($1, 24.1, 'celsius', 'validated'),
-                ($2, 65.0, 'percent', 'pending')
-        """, sensor1_id, sensor2_id)
-        
-        print("✅ Sample data initialized successfully!")
-        
+        result = await conn.execute(
+            SEED_SQL,
+            SensorType.temperature.to_int(),
+            SensorType.humidity.to_int(),
+            SensorType.pressure.to_int(),
+            SensorStatus.active.to_int(),
+            SensorStatus.inactive.to_int(),
+            DataStatus.VALIDATED.to_int(),
+            DataStatus.PENDING.to_int()
+        )
     finally:
         await conn.close()
+    
+    # Command tag is "INSERT 0 <rows>"
+    if result.endswith(" 0"):
+        print("✅ Sample data already exists")
+    else:
+        print("✅ Sample data initialized successfully!")
 
 
 if __name__ == "__main__":
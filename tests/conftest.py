@@ -1,32 +1,120 @@
+import asyncio
+import os
+import asyncpg
 import pytest
 from httpx import AsyncClient, ASGITransport
 from app.main import app
+from app.config import settings
 from app.database import DatabasePool
+from app.models import SensorType, SensorStatus, DataStatus
+
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and does not support Windows
+    uvloop = None
 
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    import asyncio
-    policy = asyncio.get_event_loop_policy()
-    loop = policy.new_event_loop()
-    yield loop
-    loop.close()
-
-
-@pytest.fixture(scope="function", autouse=True)
-async def setup_database():
-    """Setup and teardown database for each test"""
-    # Create pool before each test
-    await DatabasePool.create_pool()
-    yield
-    # Close pool after each test
+def event_loop_policy():
+    """Run the session loop on uvloop when it is installed"""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+# Set by pytest-xdist in each worker process ("gw0", "gw1", ...)
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+
+# The suite deletes every row of the database it runs against, so outside of xdist clones
+# it only runs against a database named as disposable
+TEST_DATABASE_SUFFIX = "_test"
+
+
+async def _run_in_maintenance_database(*statements: str):
+    """Run statements that cannot execute inside the target database, such as CREATE DATABASE"""
+    connection = await asyncpg.connect(
+        host=settings.database_host,
+        port=settings.database_port,
+        user=settings.database_user,
+        password=settings.database_password,
+        database="postgres"
+    )
+    try:
+        for statement in statements:
+            await connection.execute(statement)
+    finally:
+        await connection.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def database_pool():
+    """
+    Open one connection pool for the whole test session.
+    Under pytest-xdist every worker runs against its own clone of the migrated database,
+    so workers never see each other's rows.
+    """
+    worker_database = None
+    if XDIST_WORKER is None and not settings.database_name.endswith(TEST_DATABASE_SUFFIX):
+        pytest.exit(
+            f'Refusing to run against database "{settings.database_name}": the suite deletes its rows. '
+            f'Point DATABASE_NAME at a migrated database whose name ends in "{TEST_DATABASE_SUFFIX}", '
+            f"or run with pytest -n to test against per-worker clones.",
+            returncode=pytest.ExitCode.USAGE_ERROR
+        )
+    if XDIST_WORKER is not None:
+        worker_database = f"{settings.database_name}_{XDIST_WORKER}"
+        await _run_in_maintenance_database(
+            f'DROP DATABASE IF EXISTS "{worker_database}" WITH (FORCE)',
+            f'CREATE DATABASE "{worker_database}" TEMPLATE "{settings.database_name}"'
+        )
+        settings.database_name = worker_database
+        # database_url is cached; drop it so the pool connects to the clone
+        settings.__dict__.pop("database_url", None)
+    
+    # Tests use a connection or two at a time; a production-sized pool per xdist worker
+    # would exhaust max_connections and pay the connection setup many times over
+    settings.database_pool_min = 1
+    settings.database_pool_max = 2
+    pool = await DatabasePool.create_pool()
+    # Tests roll back what they write, so only rows from outside the suite need clearing;
+    # the database is a clone or a dedicated test database, checked above
+    await pool.execute("DELETE FROM units")
+    yield pool
     await DatabasePool.close_pool()
+    
+    if worker_database is not None:
+        await _run_in_maintenance_database(f'DROP DATABASE IF EXISTS "{worker_database}" WITH (FORCE)')
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+async def database(request, database_pool):
+    """
+    Run each test inside a transaction that is rolled back afterwards.
+    The connection is bound to the test's context, so the app's requests run on it too.
+    Tests marked "commits" need real commits and instead get the pool, with the tables
+    emptied once they finish.
+    """
+    if request.node.get_closest_marker("commits"):
+        yield database_pool
+        # Deleting the units cascades to sensors and sensor data; far cheaper than TRUNCATE,
+        # which rewrites every partition
+        await database_pool.execute("DELETE FROM units")
+        return
+    
+    async with DatabasePool.connection() as connection:
+        transaction = connection.transaction()
+        await transaction.start()
+        try:
+            yield connection
+        finally:
+            # Sequences are not rolled back, so rows cached by earlier tests are never looked up again
+            await transaction.rollback()
+
+
+@pytest.fixture(scope="session")
 async def client():
-    """Create test client"""
+    """Create one test client for the whole session; the app keeps no state between requests"""
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test"
@@ -34,46 +122,59 @@ async def client():
         yield ac
 
 
+async def _insert_unit(database, **fields) -> dict:
+    """Insert a unit directly, bypassing the API"""
+    row = await database.fetchrow(
+        "INSERT INTO units (name, location, description) VALUES ($1, $2, $3) RETURNING *",
+        fields.get("name", "Test Unit"),
+        fields.get("location", "Test Location"),
+        fields.get("description", "Test Description")
+    )
+    return dict(row)
+
+
+async def _insert_sensor(database, unit_id: int, **fields) -> dict:
+    """Insert a sensor directly, bypassing the API"""
+    row = await database.fetchrow(
+        """
+        INSERT INTO sensors (name, sensor_type, unit_id, status, description)
+        VALUES ($1, $2, $3, $4, $5)
+        RETURNING *
+        """,
+        fields.get("name", "Test Sensor"),
+        fields.get("sensor_type", SensorType.temperature).to_int(),
+        unit_id,
+        fields.get("status", SensorStatus.active).to_int(),
+        fields.get("description", "Test Sensor Description")
+    )
+    return dict(row)
+
+
+async def _insert_sensor_data(database, sensor_id: int, **fields) -> dict:
+    """Insert a sensor data entry directly, bypassing the API"""
+    row = await database.fetchrow(
+        "INSERT INTO sensor_data (sensor_id, value, unit, status) VALUES ($1, $2, $3, $4) RETURNING *",
+        sensor_id,
+        fields.get("value", 25.5),
+        fields.get("unit", "celsius"),
+        fields.get("status", DataStatus.PENDING).to_int()
+    )
+    return dict(row)
+
+
 @pytest.fixture
-async def sample_unit(client):
+async def sample_unit(database):
     """Create a sample unit for testing"""
-    response = await client.post(
-        "/api/v1/units/",
-        json={
-            "name": "Test Unit",
-            "location": "Test Location",
-            "description": "Test Description"
-        }
-    )
-    return response.json()
+    return await _insert_unit(database)
 
 
 @pytest.fixture
-async def sample_sensor(client, sample_unit):
+async def sample_sensor(database, sample_unit):
     """Create a sample sensor for testing"""
-    response = await client.post(
-        "/api/v1/sensors/",
-        json={
-            "name": "Test Sensor",
-            "sensor_type": "temperature",
-            "unit_id": sample_unit["id"],
-            "status": "active",
-            "description": "Test Sensor Description"
-        }
-    )
-    return response.json()
+    return await _insert_sensor(database, sample_unit["id"])
 
 
 @pytest.fixture
-async def sample_sensor_data(client, sample_sensor):
+async def sample_sensor_data(database, sample_sensor):
     """Create a sample sensor data for testing"""
-    response = await client.post(
-        "/api/v1/sensor-data/",
-        json={
-            "sensor_id": sample_sensor["id"],
-            "value": 25.5,
-            "unit": "celsius",
-            "status": "pending"
-        }
-    )
-    return response.json()
\ No newline at end of file
+    return await _insert_sensor_data(database, sample_sensor["id"])
\ No newline at end of file
@@ -0,0 +1,77 @@
+import pytest
+import asyncio
+import time
+from app import tasks
+from app.config import settings
+from app.database import DatabasePool
+from app.repositories import UnitRepository, SensorDataRepository
+
+
+async def test_statement_prepared_once_per_connection(database_pool):
+    """Test that repeating a parameterised query reuses the cached prepared statement"""
+    query = "SELECT id FROM units WHERE id = $1"
+    async with DatabasePool.connection() as connection:
+        for unit_id in range(1, 4):
+            await connection.fetchval(query, unit_id)
+        prepared = await connection.fetchval(
+            "SELECT count(*) FROM pg_prepared_statements WHERE statement = $1", query
+        )
+    assert prepared == 1
+
+
+async def test_hot_statements_prepared_on_connect(database_pool):
+    """Test that a fresh pooled connection holds the hot statements, and no locks from preparing them"""
+    async with database_pool.acquire() as connection, database_pool.acquire() as observer:
+        # Checked before the connection runs anything that would release them
+        locks = await observer.fetchval(
+            "SELECT count(*) FROM pg_locks WHERE pid = $1 AND locktype = 'relation'",
+            connection.get_server_pid()
+        )
+        prepared = await connection.fetchval(
+            "SELECT count(*) FROM pg_prepared_statements WHERE statement = ANY($1::text[])",
+            [UnitRepository.SELECT_BY_ID_SQL, UnitRepository.INSERT_SQL]
+        )
+    assert prepared == 2
+    assert locks == 0
+
+
+async def test_ensure_partitions_moves_rows_out_of_default(database, sample_sensor):
+    """Test that a partition created late takes over the rows parked in the default partition"""
+    insert_sql = """
+        INSERT INTO sensor_data (sensor_id, value, timestamp)
+        VALUES ($1, 1.0, now() + interval '8 months')
+        RETURNING id, tableoid::regclass::text AS partition
+    """
+    row = await database.fetchrow(insert_sql, sample_sensor["id"])
+    assert row["partition"] == "sensor_data_default"
+    
+    await SensorDataRepository().ensure_partitions(8)
+    partition, expected = await database.fetchrow(
+        """
+        SELECT tableoid::regclass::text, to_char(timestamp, '"sensor_data_"YYYY_MM')
+        FROM sensor_data WHERE id = $1
+        """,
+        row["id"]
+    )
+    assert partition == expected
+
+
+async def test_database_health_probe_times_out(monkeypatch):
+    """Test that a probe stuck on the database reports unhealthy instead of hanging"""
+    async def hang():
+        await asyncio.sleep(60)
+    
+    monkeypatch.setattr(tasks, "_select_one", hang)
+    monkeypatch.setattr(settings, "health_check_timeout_seconds", 0.01)
+    health = await tasks.probe_database()
+    assert not health["ok"]
+    assert "did not respond" in health["error"]
+
+
+async def test_database_health_stale_result_unhealthy(monkeypatch):
+    """Test that a cached healthy result stops counting once the probe loop falls behind"""
+    stale_at = time.time() - 4 * settings.health_check_interval_seconds
+    monkeypatch.setattr(tasks, "_database_health", {"ok": True, "checked_at": stale_at, "error": None})
+    health = await tasks.get_database_health()
+    assert not health["ok"]
+    assert health["checked_at"] == stale_at
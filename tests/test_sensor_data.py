@@ -1,8 +1,11 @@
+import json
 import pytest
+from fastapi import HTTPException
 from httpx import AsyncClient
+from app.models import SensorDataCreate
+from app.services import sensor_data_service
 
 
-@pytest.mark.asyncio
 async def test_create_sensor_data(client: AsyncClient, sample_sensor):
     """Test creating sensor data"""
     response = await client.post(
@@ -23,21 +26,15 @@ async def test_create_sensor_data(client: AsyncClient, sample_sensor):
     assert "timestamp" in data
 
 
-@pytest.mark.asyncio
-async def test_create_sensor_data_invalid_sensor(client: AsyncClient):
+async def test_create_sensor_data_invalid_sensor():
     """Test creating sensor data with invalid sensor_id"""
-    response = await client.post(
-        "/api/v1/sensor-data/",
-        json={
-            "sensor_id": 99999,
-            "value": 23.5,
-            "unit": "celsius"
-        }
-    )
-    assert response.status_code == 404
+    with pytest.raises(HTTPException) as exc_info:
+        await sensor_data_service.create_sensor_data(
+            SensorDataCreate(sensor_id=99999, value=23.5, unit="celsius")
+        )
+    assert exc_info.value.status_code == 404
 
 
-@pytest.mark.asyncio
 async def test_get_sensor_data(client: AsyncClient, sample_sensor_data):
     """Test getting sensor data by ID"""
     response = await client.get(f"/api/v1/sensor-data/{sample_sensor_data['id']}")
@@ -46,49 +43,96 @@ async def test_get_sensor_data(client: AsyncClient, sample_sensor_data):
     assert data["id"] == sample_sensor_data["id"]
 
 
-@pytest.mark.asyncio
-async def test_get_all_sensor_data(client: AsyncClient):
-    """Test getting all sensor data"""
-    response = await client.get("/api/v1/sensor-data/")
+@pytest.mark.parametrize("query", [
+    "",
+    "?sensor_id={sensor_id}",
+    "?status=pending",
+    "?with_details=true"
+])
+async def test_list_sensor_data(client: AsyncClient, sample_sensor_data, query):
+    """Test listing sensor data with each supported filter"""
+    response = await client.get("/api/v1/sensor-data/" + query.format(sensor_id=sample_sensor_data["sensor_id"]))
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
+    assert [item["id"] for item in data] == [sample_sensor_data["id"]]
+    if "with_details" in query:
+        assert {"sensor_name", "sensor_type", "unit_name"} <= data[0].keys()
+
+
+async def test_get_sensor_data_cursor_pagination(client: AsyncClient, sample_sensor):
+    """Test paging through sensor data with the X-Next-Cursor header"""
+    # One batch shares a timestamp, so the id tie-breaker is exercised
+    await client.post(
+        "/api/v1/sensor-data/bulk",
+        json=[{"sensor_id": sample_sensor["id"], "value": float(i)} for i in range(5)]
+    )
+    
+    seen = []
+    url = f"/api/v1/sensor-data/?sensor_id={sample_sensor['id']}&limit=2"
+    response = await client.get(url)
+    while True:
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = await client.get(f"{url}&cursor={cursor}")
+    
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
 
 
-@pytest.mark.asyncio
-async def test_get_sensor_data_by_sensor(client: AsyncClient, sample_sensor, sample_sensor_data):
-    """Test getting sensor data filtered by sensor_id"""
-    response = await client.get(f"/api/v1/sensor-data/?sensor_id={sample_sensor['id']}")
+async def test_get_sensor_data_invalid_cursor(client: AsyncClient):
+    """Test that a malformed cursor is rejected"""
+    response = await client.get("/api/v1/sensor-data/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+async def test_get_sensor_data_not_modified(client: AsyncClient, sample_sensor_data):
+    """Test that a matching If-None-Match returns 304 until the data changes"""
+    url = f"/api/v1/sensor-data/?sensor_id={sample_sensor_data['sensor_id']}"
+    response = await client.get(url)
     assert response.status_code == 200
-    data = response.json()
-    assert isinstance(data, list)
-    assert len(data) > 0
-    assert all(item["sensor_id"] == sample_sensor["id"] for item in data)
+    etag = response.headers["ETag"]
+    
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    
+    await client.put(f"/api/v1/sensor-data/{sample_sensor_data['id']}", json={"value": 1.5})
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
 
 
-@pytest.mark.asyncio
-async def test_get_sensor_data_by_status(client: AsyncClient, sample_sensor_data):
-    """Test getting sensor data filtered by status"""
-    response = await client.get("/api/v1/sensor-data/?status=pending")
+async def test_get_sensor_data_etag_follows_database(client: AsyncClient, database, sample_sensor_data):
+    """Test that writes made outside the app, e.g. by another worker, change the ETag"""
+    url = "/api/v1/sensor-data/?with_details=true"
+    etag = (await client.get(url)).headers["ETag"]
+    
+    await database.execute("UPDATE sensor_data SET status = 1 WHERE id = $1", sample_sensor_data["id"])
+    response = await client.get(url, headers={"If-None-Match": etag})
     assert response.status_code == 200
-    data = response.json()
-    assert isinstance(data, list)
+    assert response.headers["ETag"] != etag
+    etag = response.headers["ETag"]
+    
+    await database.execute("UPDATE sensors SET name = 'Renamed' WHERE id = $1", sample_sensor_data["sensor_id"])
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
 
 
-@pytest.mark.asyncio
-async def test_get_sensor_data_with_details(client: AsyncClient, sample_sensor_data):
-    """Test getting sensor data with details"""
-    response = await client.get("/api/v1/sensor-data/?with_details=true")
+@pytest.mark.commits
+async def test_stream_sensor_data(client: AsyncClient, sample_sensor_data):
+    """Test streaming sensor data as NDJSON"""
+    response = await client.get("/api/v1/sensor-data/stream?limit=5&with_details=true")
     assert response.status_code == 200
-    data = response.json()
-    assert isinstance(data, list)
-    if len(data) > 0:
-        assert "sensor_name" in data[0]
-        assert "sensor_type" in data[0]
-        assert "unit_name" in data[0]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert 0 < len(rows) <= 5
+    assert "sensor_name" in rows[0]
 
 
-@pytest.mark.asyncio
 async def test_update_sensor_data(client: AsyncClient, sample_sensor_data):
     """Test updating sensor data"""
     response = await client.put(
@@ -104,7 +148,6 @@ async def test_update_sensor_data(client: AsyncClient, sample_sensor_data):
     assert data["status"] == "validated"
 
 
-@pytest.mark.asyncio
 async def test_validate_sensor_data(client: AsyncClient, sample_sensor):
     """Test validating sensor data"""
     # Create sensor data first
@@ -126,7 +169,41 @@ async def test_validate_sensor_data(client: AsyncClient, sample_sensor):
     assert data["status"] == "validated"
 
 
-@pytest.mark.asyncio
+async def test_validate_sensor_data_conflict(client: AsyncClient, sample_sensor):
+    """Test validating already validated or archived sensor data"""
+    create_response = await client.post(
+        "/api/v1/sensor-data/",
+        json={
+            "sensor_id": sample_sensor["id"],
+            "value": 20.0,
+            "unit": "celsius",
+            "status": "validated"
+        }
+    )
+    data_id = create_response.json()["id"]
+    
+    response = await client.put(f"/api/v1/sensor-data/{data_id}/validate")
+    assert response.status_code == 409
+    
+    await client.put(f"/api/v1/sensor-data/{data_id}/archive")
+    response = await client.put(f"/api/v1/sensor-data/{data_id}/validate")
+    assert response.status_code == 409
+    assert "archived" in response.json()["message"]
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("GET", "/api/v1/sensor-data/999999", None),
+    ("PUT", "/api/v1/sensor-data/999999", {"value": 1.0}),
+    ("PUT", "/api/v1/sensor-data/999999/validate", None),
+    ("PUT", "/api/v1/sensor-data/999999/archive", None),
+    ("DELETE", "/api/v1/sensor-data/999999", None)
+])
+async def test_sensor_data_not_found(client: AsyncClient, method, path, body):
+    """Test every single-entry endpoint with a non-existent ID"""
+    response = await client.request(method, path, json=body)
+    assert response.status_code == 404
+
+
 async def test_archive_sensor_data(client: AsyncClient, sample_sensor):
     """Test archiving sensor data"""
     # Create sensor data first
@@ -148,24 +225,45 @@ async def test_archive_sensor_data(client: AsyncClient, sample_sensor):
     assert data["status"] == "archived"
 
 
-@pytest.mark.asyncio
-async def test_delete_sensor_data(client: AsyncClient, sample_sensor):
+async def test_delete_sensor_data(client: AsyncClient, database, sample_sensor_data):
     """Test deleting sensor data"""
-    # Create sensor data first
-    create_response = await client.post(
-        "/api/v1/sensor-data/",
-        json={
-            "sensor_id": sample_sensor["id"],
-            "value": 22.0,
-            "unit": "celsius"
-        }
-    )
-    data_id = create_response.json()["id"]
-    
-    # Delete it
-    delete_response = await client.delete(f"/api/v1/sensor-data/{data_id}")
-    assert delete_response.status_code == 200
+    delete_response = await client.delete(f"/api/v1/sensor-data/{sample_sensor_data['id']}")
+    assert delete_response.status_code == 204
+    assert delete_response.content == b""
     
     # Verify it's deleted
-    get_response = await client.get(f"/api/v1/sensor-data/{data_id}")
-    assert get_response.status_code == 404
\ No newline at end of file
+    assert await database.fetchval("SELECT count(*) FROM sensor_data WHERE id = $1", sample_sensor_data["id"]) == 0
+
+async def test_create_sensor_data_bulk(client: AsyncClient, database, sample_sensor):
+    """Test bulk creating sensor data"""
+    response = await client.post(
+        "/api/v1/sensor-data/bulk",
+        json=[
+            {"sensor_id": sample_sensor["id"], "value": 20.0 + i, "unit": "celsius"}
+            for i in range(5)
+        ]
+    )
+    assert response.status_code == 201
+    assert response.json()["inserted"] == 5
+    
+    assert await database.fetchval("SELECT count(*) FROM sensor_data WHERE sensor_id = $1", sample_sensor["id"]) == 5
+
+
+async def test_create_sensor_data_bulk_copy(client: AsyncClient, sample_sensor):
+    """Test bulk creating a batch large enough to use COPY"""
+    response = await client.post(
+        "/api/v1/sensor-data/bulk",
+        json=[
+            {"sensor_id": sample_sensor["id"], "value": float(i), "status": "validated"}
+            for i in range(1500)
+        ]
+    )
+    assert response.status_code == 201
+    assert response.json()["inserted"] == 1500
+
+
+async def test_create_sensor_data_bulk_invalid_sensor():
+    """Test bulk creating sensor data with invalid sensor_id"""
+    with pytest.raises(HTTPException) as exc_info:
+        await sensor_data_service.create_sensor_data_bulk([SensorDataCreate(sensor_id=99999, value=23.5)])
+    assert exc_info.value.status_code == 400
@@ -1,8 +1,10 @@
 import pytest
+from fastapi import HTTPException
 from httpx import AsyncClient
+from app.models import SensorCreate
+from app.services import sensor_service
 
 
-@pytest.mark.asyncio
 async def test_create_sensor(client: AsyncClient, sample_unit):
     """Test creating a sensor"""
     response = await client.post(
@@ -23,22 +25,15 @@ async def test_create_sensor(client: AsyncClient, sample_unit):
     assert "id" in data
 
 
-@pytest.mark.asyncio
-async def test_create_sensor_invalid_unit(client: AsyncClient):
+async def test_create_sensor_invalid_unit():
     """Test creating a sensor with invalid unit_id"""
-    response = await client.post(
-        "/api/v1/sensors/",
-        json={
-            "name": "Test Sensor",
-            "sensor_type": "temperature",
-            "unit_id": 99999,
-            "status": "active"
-        }
-    )
-    assert response.status_code == 404
+    with pytest.raises(HTTPException) as exc_info:
+        await sensor_service.create_sensor(
+            SensorCreate(name="Test Sensor", sensor_type="temperature", unit_id=99999, status="active")
+        )
+    assert exc_info.value.status_code == 404
 
 
-@pytest.mark.asyncio
 async def test_get_sensor(client: AsyncClient, sample_sensor):
     """Test getting a sensor by ID"""
     response = await client.get(f"/api/v1/sensors/{sample_sensor['id']}")
@@ -47,27 +42,26 @@ async def test_get_sensor(client: AsyncClient, sample_sensor):
     assert data["id"] == sample_sensor["id"]
 
 
-@pytest.mark.asyncio
-async def test_get_all_sensors(client: AsyncClient):
-    """Test getting all sensors"""
-    response = await client.get("/api/v1/sensors/")
+@pytest.mark.parametrize("query", ["", "?unit_id={unit_id}"])
+async def test_list_sensors(client: AsyncClient, sample_sensor, query):
+    """Test listing sensors, unfiltered and filtered by unit_id"""
+    response = await client.get("/api/v1/sensors/" + query.format(unit_id=sample_sensor["unit_id"]))
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
+    assert [sensor["id"] for sensor in data] == [sample_sensor["id"]]
 
 
-@pytest.mark.asyncio
-async def test_get_sensors_by_unit(client: AsyncClient, sample_unit, sample_sensor):
-    """Test getting sensors filtered by unit_id"""
-    response = await client.get(f"/api/v1/sensors/?unit_id={sample_unit['id']}")
-    assert response.status_code == 200
-    data = response.json()
-    assert isinstance(data, list)
-    assert len(data) > 0
-    assert all(sensor["unit_id"] == sample_unit["id"] for sensor in data)
+@pytest.mark.parametrize("method, body", [
+    ("GET", None),
+    ("PUT", {"name": "Renamed Sensor"}),
+    ("DELETE", None)
+])
+async def test_sensor_not_found(client: AsyncClient, method, body):
+    """Test the single-sensor endpoints with a non-existent ID"""
+    response = await client.request(method, "/api/v1/sensors/99999", json=body)
+    assert response.status_code == 404
 
 
-@pytest.mark.asyncio
 async def test_update_sensor(client: AsyncClient, sample_sensor):
     """Test updating a sensor"""
     response = await client.put(
@@ -83,25 +77,10 @@ async def test_update_sensor(client: AsyncClient, sample_sensor):
     assert data["status"] == "inactive"
 
 
-@pytest.mark.asyncio
-async def test_delete_sensor(client: AsyncClient, sample_unit):
+async def test_delete_sensor(client: AsyncClient, database, sample_sensor):
     """Test deleting a sensor"""
-    # Create a sensor first
-    create_response = await client.post(
-        "/api/v1/sensors/",
-        json={
-            "name": "Sensor to Delete",
-            "sensor_type": "humidity",
-            "unit_id": sample_unit["id"],
-            "status": "active"
-        }
-    )
-    sensor_id = create_response.json()["id"]
-    
-    # Delete it
-    delete_response = await client.delete(f"/api/v1/sensors/{sensor_id}")
+    delete_response = await client.delete(f"/api/v1/sensors/{sample_sensor['id']}")
     assert delete_response.status_code == 200
     
     # Verify it's deleted
-    get_response = await client.get(f"/api/v1/sensors/{sensor_id}")
-    assert get_response.status_code == 404
\ No newline at end of file
+    assert await database.fetchval("SELECT count(*) FROM sensors WHERE id = $1", sample_sensor["id"]) == 0
@@ -1,8 +1,8 @@
 import pytest
 from httpx import AsyncClient
+from app.repositories import UnitRepository
 
 
-@pytest.mark.asyncio
 async def test_create_unit(client: AsyncClient):
     """Test creating a unit"""
     response = await client.post(
@@ -21,7 +21,6 @@ async def test_create_unit(client: AsyncClient):
     assert "created_at" in data
 
 
-@pytest.mark.asyncio
 async def test_get_unit(client: AsyncClient, sample_unit):
     """Test getting a unit by ID"""
     response = await client.get(f"/api/v1/units/{sample_unit['id']}")  
@@ -31,23 +30,36 @@ async def test_get_unit(client: AsyncClient, sample_unit):
     assert data["name"] == sample_unit["name"]
 
 
-@pytest.mark.asyncio
-async def test_get_unit_not_found(client: AsyncClient):
-    """Test getting a non-existent unit"""
-    response = await client.get("/api/v1/units/99999")
+async def test_get_unit_not_modified(client: AsyncClient, sample_unit):
+    """Test that a matching If-None-Match returns 304 with no body"""
+    response = await client.get(f"/api/v1/units/{sample_unit['id']}")
+    etag = response.headers["ETag"]
+    
+    response = await client.get(f"/api/v1/units/{sample_unit['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("GET", "/api/v1/units/99999", None),
+    ("PUT", "/api/v1/units/99999", {"name": "Renamed Unit"}),
+    ("DELETE", "/api/v1/units/99999", None),
+    ("GET", "/api/v1/units/99999/statistics", None)
+])
+async def test_unit_not_found(client: AsyncClient, method, path, body):
+    """Test the single-unit endpoints with a non-existent ID"""
+    response = await client.request(method, path, json=body)
     assert response.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_get_all_units(client: AsyncClient):
+async def test_get_all_units(client: AsyncClient, sample_unit):
     """Test getting all units"""
-    response = await client.get("/api/v1/units/")  
+    response = await client.get("/api/v1/units/")
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
+    assert [unit["id"] for unit in data] == [sample_unit["id"]]
 
 
-@pytest.mark.asyncio
 async def test_update_unit(client: AsyncClient, sample_unit):
     """Test updating a unit"""
     response = await client.put(
@@ -63,29 +75,16 @@ async def test_update_unit(client: AsyncClient, sample_unit):
     assert data["location"] == "Updated Location"
 
 
-@pytest.mark.asyncio
-async def test_delete_unit(client: AsyncClient):
-    """Test deleting a unit"""
-    # Create a unit first
-    create_response = await client.post(
-        "/api/v1/units/",
-        json={
-            "name": "Unit to Delete",
-            "location": "Temporary Location"
-        }
-    )
-    unit_id = create_response.json()["id"]
-    
-    # Delete it
-    delete_response = await client.delete(f"/api/v1/units/{unit_id}")  
+async def test_delete_unit(client: AsyncClient, database, sample_unit, sample_sensor_data):
+    """Test deleting a unit, which cascades to its sensors and their data"""
+    delete_response = await client.delete(f"/api/v1/units/{sample_unit['id']}")
     assert delete_response.status_code == 200
     
-    # Verify it's deleted
-    get_response = await client.get(f"/api/v1/units/{unit_id}")  
-    assert get_response.status_code == 404
+    # Verify it's deleted, along with everything under it
+    assert await database.fetchval("SELECT count(*) FROM units WHERE id = $1", sample_unit["id"]) == 0
+    assert await database.fetchval("SELECT count(*) FROM sensor_data WHERE id = $1", sample_sensor_data["id"]) == 0
 
 
-@pytest.mark.asyncio
 async def test_get_unit_statistics(client: AsyncClient, sample_unit, sample_sensor):
     """Test getting unit statistics"""
     response = await client.get(f"/api/v1/units/{sample_unit['id']}/statistics")  
@@ -94,4 +93,24 @@ async def test_get_unit_statistics(client: AsyncClient, sample_unit, sample_sens
     assert "unit_id" in data
     assert "total_sensors" in data
     assert "active_sensors" in data
-    assert data["unit_id"] == sample_unit["id"]
\ No newline at end of file
+    assert data["unit_id"] == sample_unit["id"]
+
+
+async def test_get_unit_statistics_after_refresh(client: AsyncClient, sample_unit, sample_sensor_data):
+    """Test unit statistics served from the refreshed materialized view"""
+    assert await UnitRepository().refresh_statistics()
+    
+    response = await client.get(f"/api/v1/units/{sample_unit['id']}/statistics")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_sensors"] == 1
+    assert data["active_sensors"] == 1
+    assert data["total_data_points"] == 1
+
+
+async def test_refresh_unit_statistics_skipped_while_locked(database_pool):
+    """Test that a refresh is skipped while another process holds the refresh lock"""
+    async with database_pool.acquire() as other_process:
+        async with other_process.transaction():
+            assert await other_process.fetchval(UnitRepository.TRY_REFRESH_LOCK_SQL)
+            assert not await UnitRepository().refresh_statistics()